@@ -1,60 +1,237 @@
-from fastapi import FastAPI, UploadFile, File, Form, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, UploadFile, File, Form, Request, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 from interview_logic.TTS.edge_tts_engine import EdgeTTS
-from interview_logic.STT.whisper_stt import WhisperSTT
-import tempfile, shutil, os
-import requests
+from interview_logic.TTS.tts_cache import TTSCache
+from interview_logic.LLM.webhook_client import WebhookClient, CircuitBreaker, FALLBACK_RESPONSE
+from interview_logic.LLM.payload_builder import PayloadBuilder
+from interview_logic.LLM.response_cache import ResponseCache
+from interview_logic.LLM.decision_backend import create_decision_backend
+from interview_logic.STT.model_manager import ModelManager, ModelNotReady
+from interview_logic.STT.transcription_pool import TranscriptionPool, TranscriptionQueueFull
+from interview_logic.STT.streaming_stt import StreamingTranscriber
+from interview_logic.utils.audio_io import AudioDecodeError, container_format, decode_upload, SAMPLE_RATE
+from interview_logic.utils.vad import speech_chunks
+from interview_logic.utils.latency import LatencyRecorder
+from interview_logic.utils.logs import setup_logging
+from interview_logic.utils.tracing import Tracer
+from interview_logic.sessions.session_store import create_session_store
+from interview_logic.sessions.transcript import append_entry, entry_dict, reset_transcript, rollback_transcript, transcript_mark
+from interview_logic import config
+import asyncio
+import logging
+import time
+from urllib.parse import quote
 import json
 
+setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATE)
+log = logging.getLogger("interview.api")
+
 app = FastAPI()
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
-stt = WhisperSTT()
-tts = EdgeTTS()
+if config.ENGINE_MODE == "remote":
+    # Whisper and TTS run in engine_worker.py; this process never imports torch
+    from interview_logic.utils.engine_link import EngineClient
+    from interview_logic.STT.remote_stt import RemoteModels
+    from interview_logic.TTS.remote_tts import RemoteTTS
+
+    engine = EngineClient(config.ENGINE_ADDRESS, config.ENGINE_AUTHKEY, max_connections=config.ENGINE_CONNECTIONS)
+    models = RemoteModels(engine, variants=config.STT_MODEL_VARIANTS, default=config.STT_DEFAULT_VARIANT)
+    tts = RemoteTTS(engine)
+else:
+    # Whisper loads in the background (see startup below) so the server comes up at once
+    engine = None
+    models = ModelManager(
+        variants=config.STT_MODEL_VARIANTS,
+        default=config.STT_DEFAULT_VARIANT,
+        warmup=config.STT_WARMUP,
+    )
+    if config.STT_PRELOAD:
+        # Load before the server forks workers so they share the weights copy-on-write
+        models.preload()
+    tts = EdgeTTS(cache=TTSCache(
+        max_bytes=config.TTS_CACHE_MAX_BYTES,
+        disk_dir=config.TTS_CACHE_DIR,
+        disk_max_bytes=config.TTS_CACHE_DISK_MAX_BYTES,
+    ))
+first_audio_latency = LatencyRecorder()
+# End of the candidate's answer (arrival of /answer) to the first AI audio chunk
+turn_gap_latency = LatencyRecorder()
+# Stage timings per session and turn (/trace) and as histograms (/metrics)
+tracer = Tracer(turns_per_session=config.TRACE_TURNS_PER_SESSION, max_sessions=config.SESSION_MAX_COUNT)
+webhook = WebhookClient(
+    config.WEBHOOK_URL,
+    timeout=config.WEBHOOK_TIMEOUT,
+    retries=config.WEBHOOK_RETRIES,
+    breaker=CircuitBreaker(config.WEBHOOK_BREAKER_THRESHOLD, config.WEBHOOK_BREAKER_RESET_SECONDS),
+    compress=config.WEBHOOK_GZIP,
+)
+decisions = create_decision_backend(config.DECISION_BACKEND, webhook)
+webhook_cache = ResponseCache(ttl_seconds=config.WEBHOOK_CACHE_TTL_SECONDS, max_entries=config.WEBHOOK_CACHE_MAX_ENTRIES)
+payload_builder = PayloadBuilder(mode=config.WEBHOOK_PAYLOAD_MODE, token_budget=config.WEBHOOK_TOKEN_BUDGET)
+stt_pool = TranscriptionPool(
+    workers=config.STT_WORKERS,
+    max_queue=config.STT_MAX_QUEUE,
+    max_batch=config.STT_MAX_BATCH,
+)
+
+# One state dict per interview, keyed by the session_id handed out by /start
+# (or by the first /submit_custom_question call)
+sessions = create_session_store(
+    config.SESSION_BACKEND,
+    db_path=config.SESSION_DB_PATH,
+    ttl_seconds=config.SESSION_TTL_SECONDS,
+    max_sessions=config.SESSION_MAX_COUNT,
+    log_path=config.TRANSCRIPT_LOG_PATH,
+    log_flush_interval=config.TRANSCRIPT_LOG_FLUSH_MS / 1000,
+    log_fsync=config.TRANSCRIPT_LOG_FSYNC,
+    lease_seconds=config.SESSION_LEASE_SECONDS,
+)
+
+
+# Open /ws/answer sockets, capped by stream_capacity()
+active_streams = 0
+
+
+def stream_capacity():
+    return config.STREAM_MAX_CONCURRENT or config.STREAM_PER_MODEL * models.loaded_count()
+
+
+def speech_url(text, session_id=None):
+    url = f"/speak_question?question={quote(text)}"
+    return f"{url}&session_id={session_id}" if session_id else url
+
+
+def prepare_audio(audio_bytes, content_type=None):
+    """Decode an upload and cut it into speech-only chunks (runs in a thread).
+    Also returns how long each step took, in ms, for the turn trace."""
+    started = time.perf_counter()
+    audio = decode_upload(audio_bytes, content_type)
+    decoded = time.perf_counter()
+    chunks = speech_chunks(audio) if config.VAD_ENABLED else [audio]
+    timings = {"decode": (decoded - started) * 1000, "vad": (time.perf_counter() - decoded) * 1000}
+    return audio, chunks, timings
+
+
+def get_session(session_id):
+    state = sessions.get(session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session_id")
+    return state
+
+
+async def load_session(session_id):
+    # get_session() for async handlers; the store keeps blocking I/O off the loop
+    state = await sessions.aget(session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session_id")
+    return state
 
-# Shared state across requests
-state = {
-    "mode": None,
-    "questions": [],
-    "index": 0,
-    "is_interview_complete": False
-}
 
 @app.get("/")
 def serve_home():
     return FileResponse("app/static/index.html")
 
 @app.get("/start")
-async def start_interview(mode: str):
-    state["mode"] = mode
-    state["index"] = 0
-    state["questions"] = [{"question": "What is your greatest strength?"}] if mode == "preset" else []
-    state["transcript"] = []
-    state["is_interview_complete"] = False
+async def start_interview(mode: str, session_id: str = None):
+    # Custom interviews register their questions first, so reuse that session
+    if session_id is None or await sessions.aget(session_id) is None:
+        session_id = await sessions.acreate(mode)
+
+    async with sessions.lock(session_id):
+        state = await load_session(session_id)
+        state["mode"] = mode
+        state["index"] = 0
+        if mode == "preset":
+            state["questions"] = [{"question": "What is your greatest strength?"}]
+        tts.prewarm([q["question"] for q in state["questions"]])
+        reset_transcript(state)
+        state["is_interview_complete"] = False
+        await sessions.asave(session_id, state)
 
     first_q = state["questions"][0]["question"] if mode == "preset" else "Please input your first custom question."
-    await tts.speak(first_q)
-    return {"question": first_q}
+    # The browser plays this URL; audio streams from the first synthesized chunk
+    return {"question": first_q, "session_id": session_id, "audio_url": speech_url(first_q, session_id)}
 
 @app.post("/submit_custom_question")
 async def add_custom_question(request: Request):
     data = await request.json()
-    q_text = data.get("question")
-    if q_text:
-        state["questions"].append({"question": q_text})
-    return {"ok": True}
+    session_id = data.get("session_id")
+    if session_id is None:
+        session_id = await sessions.acreate("custom")
+
+    async with sessions.lock(session_id):
+        state = await load_session(session_id)
+        q_text = data.get("question")
+        if q_text:
+            state["questions"].append({"question": q_text})
+        await sessions.asave(session_id, state)
+    # Synthesize the question list in the background so every prompt is a cache hit
+    tts.prewarm([q["question"] for q in state["questions"]])
+    return {"ok": True, "session_id": session_id}
 
 @app.post("/answer")
 async def submit_answer(
     request: Request,
-    file: UploadFile = File(...),
-    is_followup: bool = Form(False)
+    file: UploadFile = File(None),
+    is_followup: bool = Form(False),
+    session_id: str = Form(...),
+    streamed: bool = Form(False),
+    latency_budget_ms: int = Form(None),
+    request_id: str = Form(None)
 ):
-    print("[API] /answer endpoint hit ✅")
+    log.info("/answer received", extra={"fields": {"session": session_id, "followup": is_followup}})
+
+    async with sessions.lock(session_id):
+        state = await load_session(session_id)
+        # A retried or double-submitted answer gets the original response back
+        # instead of being transcribed, sent to the webhook and applied again
+        replay = state.get("answered_requests", {}).get(request_id) if request_id else None
+        if replay is not None:
+            log.info("Replaying response for duplicate /answer", extra={"fields": {"session": session_id, "request_id": request_id}})
+            return replay
+
+        state["turn_started_at"] = time.time()
+        turn = tracer.start_turn(session_id)
+        mark = transcript_mark(state)
+        streamed_result = {key: state[key] for key in ("pending_transcript", "pending_stt_timings") if key in state}
+        try:
+            response = await process_answer(state, session_id, file, is_followup, streamed, latency_budget_ms, turn)
+            if isinstance(response, dict) and "error" in response:
+                # Not remembered, so a retry with the same request_id is
+                # processed again: without this attempt's entries, and with
+                # the streamed text it consumed
+                rollback_transcript(state, mark)
+                state.update(streamed_result)
+            elif request_id and isinstance(response, dict):
+                remember_answer(state, request_id, response)
+            return response
+        finally:
+            await sessions.asave(session_id, state)
+            turn.finish()
+            log.info("/answer done", extra={"fields": {"session": session_id, "turn": turn.number,
+                                                       "total_ms": turn.total_ms, **turn.spans}})
+
+
+def remember_answer(state, request_id, response):
+    # Only the last few are kept; a client never retries an answer it has moved past
+    answered = state.setdefault("answered_requests", {})
+    answered[request_id] = response
+    for stale in list(answered)[:-config.ANSWER_REPLAY_KEEP]:
+        del answered[stale]
+
+
+async def process_answer(state, session_id, file, is_followup, streamed=False, latency_budget_ms=None, turn=None):
+    turn = turn or tracer.start_turn(session_id)
+    # Speculatively synthesize the following question while this answer is
+    # transcribed and sent to the webhook; a no-op when it is already cached
+    upcoming = state["index"] + 1
+    speculative = [state["questions"][upcoming]["question"]] if upcoming < len(state["questions"]) else []
+    tts.prewarm(speculative)
 
     if state.get("is_interview_complete", False):
-        print("[API] Interview already marked complete. Ignoring input.")
+        log.info("Interview already complete, ignoring answer", extra={"fields": {"session": session_id}})
         return {
             "interview_complete": True,
             "transcript": state.get("transcript", []),
@@ -63,20 +240,52 @@ async def submit_answer(
         }
 
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            audio_path = tmp.name
+        if streamed:
+            # Already transcribed chunk by chunk over /ws/answer
+            transcript_text = state.pop("pending_transcript", "")
+            # Timings of the final streaming pass, queued like an upload
+            stt_timings = state.pop("pending_stt_timings", None) or {"queue_wait_ms": 0, "inference_ms": 0, "batch_size": 0}
+        else:
+            # 16 kHz PCM WAV is read as is; other uploads go through an ffmpeg pipe
+            with turn.span("upload_read"):
+                audio_bytes = await file.read()
+            audio, chunks, prep_timings = await asyncio.get_running_loop().run_in_executor(None, prepare_audio, audio_bytes, file.content_type)
+            for stage, ms in prep_timings.items():
+                turn.add(stage, ms)
+            speech_seconds = sum(len(chunk) for chunk in chunks) / SAMPLE_RATE
+            log.debug("VAD kept %.1fs of %.1fs in %d chunk(s)", speech_seconds, len(audio) / SAMPLE_RATE, len(chunks))
 
-        print("[API] Transcribing...")
-        transcript_text = stt.transcribe(audio_path)
-        os.remove(audio_path)
+            if not chunks:
+                # Nothing but silence: don't spend a Whisper pass on it
+                transcript_text = ""
+                stt_timings = {"queue_wait_ms": 0, "inference_ms": 0, "batch_size": 0}
+            else:
+                # Pick the most accurate model that fits the client's latency budget
+                variant = models.choose(latency_budget_ms, speech_seconds)
+                model = models.get(variant)
+                log.debug("Transcribing with Whisper %s", variant)
+                with turn.span("transcription"):
+                    results = await stt_pool.transcribe_all(chunks, model)
+                transcript_text = " ".join(text.strip() for text, _ in results)
+                stt_timings = {
+                    "model": variant,
+                    "queue_wait_ms": max(t["queue_wait_ms"] for _, t in results),
+                    "inference_ms": round(sum(t["inference_ms"] for _, t in results), 1),
+                    "batch_size": max(t["batch_size"] for _, t in results),
+                }
+                models.record(variant, speech_seconds, stt_timings["inference_ms"])
+            stt_timings["speech_seconds"] = round(speech_seconds, 2)
+            stt_timings["audio_seconds"] = round(len(audio) / SAMPLE_RATE, 2)
+        if stt_timings["queue_wait_ms"]:
+            turn.add("stt_queue_wait", stt_timings["queue_wait_ms"])
+        log.debug("STT queue wait %sms, inference %sms (batch of %s)",
+                  stt_timings["queue_wait_ms"], stt_timings["inference_ms"], stt_timings["batch_size"])
 
         current_index = state["index"]
-        print(f"[API] current_index: {current_index} (Question #{current_index + 1})")
-        print("[API] state['questions']:", state["questions"])
+        log.debug("current_index: %d (question #%d of %d)", current_index, current_index + 1, len(state["questions"]))
 
         if not state["questions"]:
-            print("[API] ❌ No questions available!")
+            log.warning("No questions available", extra={"fields": {"session": session_id}})
             state["is_interview_complete"] = True
             return {
                 "interview_complete": True,
@@ -86,7 +295,7 @@ async def submit_answer(
             }
         
         if current_index >= len(state["questions"]):
-            print(f"[API] Index {current_index} is beyond available questions. Ending interview.")
+            log.info("Index %d is beyond available questions, ending interview", current_index)
             state["is_interview_complete"] = True
             return {
                 "interview_complete": True,
@@ -97,66 +306,73 @@ async def submit_answer(
 
         current_question = state["questions"][current_index]["question"]
 
-        if "transcript" not in state:
-            state["transcript"] = []
-
         # Add human response to transcript
         if is_followup:
             # If this is a follow-up answer, just add the human response
-            state["transcript"].append({"speaker": "Human", "text": transcript_text, "is_followup_answer": True})
+            append_entry(state, {"speaker": "Human", "text": transcript_text, "is_followup_answer": True})
         else:
             # For regular questions, add both the question and answer to transcript
-            state["transcript"].append({"speaker": "AI", "text": current_question, "question_number": current_index + 1})
-            state["transcript"].append({"speaker": "Human", "text": transcript_text})
-
-        payload = {
-            "questions": [q["question"] for q in state["questions"]],
-            "current_question": current_index + 1,  # 1-based index for the LLM
-            "transcript": state["transcript"]
-        }
+            append_entry(state, {"speaker": "AI", "text": current_question})
+            append_entry(state, {"speaker": "Human", "text": transcript_text})
 
-        print(f"[API] Sending webhook for question #{current_index + 1}: {current_question}")
-        webhook_url = "https://hudmarr.app.n8n.cloud/webhook/fb613c07-aa88-4fbd-a3c9-ba4cdf7387a9"
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        print(f"[API] Webhook response:", response.text)
+        payload = payload_builder.build(state, current_index)
 
-        data = response.json()
+        log.debug("Asking %s for question #%d: %s", decisions.name, current_index + 1, current_question)
+        with turn.span("decision"):
+            data = await webhook_cache.get(payload, decisions.post)
+        log.debug("Decision response: %s", data)
+        if not data.get("fallback"):
+            payload_builder.mark_sent(state)
         
         if "output" not in data:
-            print("[API] No output in webhook response")
+            log.warning("No output in webhook response", extra={"fields": {"session": session_id}})
             return {
                 "error": "No output in webhook response",
                 "transcript": transcript_text,
+                "stt_timings": stt_timings,
                 "followup": None,
                 "next_question": current_index
             }
 
-        parsed_output = json.loads(data["output"])
-        print("[API] Extracted from output:", parsed_output)
+        with turn.span("json_parse"):
+            parsed_output = json.loads(data["output"])
+        log.debug("Extracted from output: %s", parsed_output)
 
         # Get the values from the parsed output
         is_follow_up = parsed_output.get("is_follow_up", False)
         next_response = parsed_output.get("response")
 
         if next_response is None:
-            print("[API] No response in webhook output")
+            log.warning("No response in webhook output", extra={"fields": {"session": session_id}})
             return {
                 "error": "No response in webhook output",
                 "transcript": transcript_text,
+                "stt_timings": stt_timings,
                 "followup": None,
                 "next_question": current_index
             }
 
+        if is_follow_up:
+            # The next question won't be asked this turn; leave edge-tts to the follow-up
+            tts.cancel_prewarm(speculative)
+        # Start synthesizing the reply now, before the client asks for it; the
+        # client's stream follows this synthesis chunk by chunk, so it never
+        # waits for the whole clip
+        tts.prewarm([next_response])
+        followup_audio_url = speech_url(next_response, session_id)
+
         # Process based on whether this is a follow-up or next question
         if is_follow_up:
-            print(f"[API] Handling follow-up question: {next_response}")
+            log.debug("Handling follow-up question: %s", next_response)
             # Add follow-up to transcript
-            state["transcript"].append({"speaker": "AI", "text": next_response, "is_followup": True})
+            append_entry(state, {"speaker": "AI", "text": next_response, "is_followup": True})
             
             # Return follow-up information, staying on same question
             return {
                 "transcript": transcript_text,
+                "stt_timings": stt_timings,
                 "followup": next_response,
+                "followup_audio_url": followup_audio_url,
                 "next_question": current_index,
                 "is_follow_up": True,
                 "interview_complete": False,
@@ -164,22 +380,24 @@ async def submit_answer(
             }
         else:
             # This is NOT a follow-up, move to next question
-            print(f"[API] Moving to next question after response: {next_response}")
+            log.debug("Moving to next question after response: %s", next_response)
             
             # Increment the question index 
             next_index = current_index + 1
             state["index"] = next_index
             
             # Add transition response to transcript
-            state["transcript"].append({"speaker": "AI", "text": next_response, "transition_to": next_index + 1})
+            append_entry(state, {"speaker": "AI", "text": next_response, "transition_to": next_index + 1})
             
             # Check if we've reached the end of questions
             if next_index >= len(state["questions"]):
-                print("[API] No more questions. Ending interview.")
+                log.info("No more questions, ending interview", extra={"fields": {"session": session_id}})
                 state["is_interview_complete"] = True
                 return {
                     "transcript": transcript_text,
+                    "stt_timings": stt_timings,
                     "followup": next_response,
+                    "followup_audio_url": followup_audio_url,
                     "next_question": None,
                     "is_follow_up": False,
                     "interview_complete": True,
@@ -190,16 +408,41 @@ async def submit_answer(
             next_question_text = state["questions"][next_index]["question"]
             return {
                 "transcript": transcript_text,
+                "stt_timings": stt_timings,
                 "followup": next_response,
+                "followup_audio_url": followup_audio_url,
                 "next_question": next_index,
                 "next_question_text": next_question_text,
+                # Prefetched while the candidate was answering; only offered when
+                # we really move on (a follow-up discards the speculation)
+                "next_question_audio_url": speech_url(next_question_text, session_id),
                 "is_follow_up": False,
                 "interview_complete": False,
                 "question_number": next_index + 1  # 1-based for display
             }
 
+    except ModelNotReady as e:
+        log.warning("Whisper not ready yet, rejecting answer: %s", e)
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "5"},
+            content={"error": "Speech recognition is still loading, please retry", "transcript": None},
+        )
+    except TranscriptionQueueFull as e:
+        log.warning("Transcription queue full, rejecting answer: %s", e)
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "2"},
+            content={"error": "Transcription queue is full, please retry", "transcript": None},
+        )
+    except AudioDecodeError as e:
+        log.warning("Could not decode the uploaded answer: %s", e, extra={"fields": {"session": session_id}})
+        return JSONResponse(
+            status_code=400,
+            content={"error": "The recording could not be decoded, please record the answer again", "transcript": None},
+        )
     except Exception as e:
-        print("[API ERROR]", str(e))
+        log.exception("/answer failed", extra={"fields": {"session": session_id}})
         return {
             "error": str(e),
             "transcript": "Error",
@@ -208,41 +451,280 @@ async def submit_answer(
         }
 
 
+@app.websocket("/ws/answer")
+async def stream_answer(websocket: WebSocket, session_id: str, mime: str = None):
+    """Receive MediaRecorder chunks while the candidate speaks and send back
+    partial transcripts. Sending the text "end" finalizes the answer; the
+    final text is kept on the session for the following /answer call.
+    `mime` is the recorder's MIME type, so ffmpeg doesn't probe every pass."""
+    if await sessions.aget(session_id) is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    global active_streams
+    if not models.is_ready() or active_streams >= stream_capacity():
+        # 1013 = try again later; the client falls back to uploading the clip
+        await websocket.close(code=1013)
+        return
+
+    loop = asyncio.get_running_loop()
+    streamer = StreamingTranscriber(models.get(), vad=config.VAD_ENABLED, input_format=container_format(mime))
+    update_task = None
+    last_update = 0.0
+    active_streams += 1
+
+    async def send_partial():
+        try:
+            text, _ = await stt_pool.run(streamer.update, partial=True)
+        except TranscriptionQueueFull:
+            # Answers are waiting: skip this partial; the audio stays buffered for the next pass
+            return
+        await websocket.send_json({"type": "partial", "text": text})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                streamer.add_chunk(message["bytes"])
+                # Only one partial pass in flight; chunks keep buffering meanwhile
+                idle = update_task is None or update_task.done()
+                if idle and loop.time() - last_update >= config.STREAM_UPDATE_INTERVAL_MS / 1000:
+                    last_update = loop.time()
+                    update_task = asyncio.create_task(send_partial())
+            elif message.get("text") == "end":
+                break
+
+        if update_task is not None:
+            await update_task
+        try:
+            text, timings = await stt_pool.run(streamer.finish)
+        except TranscriptionQueueFull as e:
+            log.warning("Transcription queue full, client will upload instead: %s", e)
+            await websocket.close(code=1013)
+            return
+        except AudioDecodeError as e:
+            # 1003 = unsupported data; the upload fallback reports the error
+            log.warning("Could not decode the streamed answer: %s", e, extra={"fields": {"session": session_id}})
+            await websocket.close(code=1003)
+            return
+        log.info("Streamed answer finalized", extra={"fields": {"session": session_id}})
+
+        async with sessions.lock(session_id):
+            state = await load_session(session_id)
+            state["pending_transcript"] = text
+            state["pending_stt_timings"] = timings
+            await sessions.asave(session_id, state)
+        await websocket.send_json({"type": "final", "text": text})
+    except WebSocketDisconnect:
+        log.info("Streaming socket closed early", extra={"fields": {"session": session_id}})
+    finally:
+        active_streams -= 1
+
+
+def stream_speech(text, session_id=None):
+    """StreamingResponse that forwards TTS chunks as they are synthesized
+    (joining a prewarm already under way for the same text) and records the
+    time until the first chunk leaves the server, plus the turn gap when
+    this is the first AI audio after a candidate's answer."""
+    started = time.perf_counter()
+
+    async def body():
+        first = True
+        async for chunk in tts.stream(text):
+            if first:
+                first = False
+                ttfa_ms = (time.perf_counter() - started) * 1000
+                first_audio_latency.record(ttfa_ms)
+                tracer.record(session_id, "tts_first_audio", ttfa_ms)
+                log.debug("Time to first audio: %.0fms", ttfa_ms)
+                await record_turn_gap(session_id)
+            yield chunk
+        tracer.record(session_id, "tts_synthesis", (time.perf_counter() - started) * 1000)
+
+    return StreamingResponse(body(), media_type="audio/mpeg", headers={"Cache-Control": "no-store"})
+
+
 @app.post("/speak_question")
 async def speak_question(request: Request):
     data = await request.json()
     question = data.get("question")
-    if question:
-        await tts.speak(question)
-    return {"status": "success"}
+    if not question:
+        return {"status": "error", "message": "No question given"}
+    return stream_speech(question, data.get("session_id"))
+
+@app.get("/speak_question")
+def speak_question_get(question: str, session_id: str = None):
+    # GET form so the browser can point an <audio> element straight at it
+    return stream_speech(question, session_id)
+
+
+async def record_turn_gap(session_id):
+    if session_id is None or await sessions.aget(session_id) is None:
+        return
+    async with sessions.lock(session_id):
+        state = await sessions.aget(session_id)
+        turn_started_at = state.pop("turn_started_at", None) if state else None
+        if turn_started_at is None:
+            return
+        await sessions.asave(session_id, state)
+    gap_ms = (time.time() - turn_started_at) * 1000
+    turn_gap_latency.record(gap_ms)
+    tracer.record(session_id, "turn_gap", gap_ms)
+    log.info("Turn gap (answer received -> first AI audio)",
+             extra={"fields": {"session": session_id, "gap_ms": round(gap_ms)}})
 
 @app.get("/transcript")
-def get_transcript():
-    """Return the full transcript with enhanced metadata"""
-    # Enhance the transcript with additional metadata
-    enhanced_transcript = []
-    
-    for i, entry in enumerate(state.get("transcript", [])):
-        # Create a copy of the entry with all its fields
-        enhanced_entry = entry.copy()
-        
-        # If this is a question, add the question number
-        if entry.get("speaker") == "AI" and not entry.get("is_followup") and not entry.get("transition_to"):
-            question_idx = 0
-            for j in range(i):
-                if state["transcript"][j].get("speaker") == "AI" and not state["transcript"][j].get("is_followup") and not state["transcript"][j].get("transition_to"):
-                    question_idx += 1
-            enhanced_entry["question_number"] = question_idx + 1
-        
-        enhanced_transcript.append(enhanced_entry)
-    
-    return JSONResponse(content={
-        "transcript": enhanced_transcript,
-        "questions": state.get("questions", []),
-        "is_complete": state.get("is_interview_complete", False)
-    })
+def get_transcript(request: Request, session_id: str, since: int = 0):
+    """Return transcript entries from offset `since` onwards.
+
+    Entries are append-only and numbered when written, so this is a slice,
+    not a rescan. Clients can poll with ?since=<next_offset> and If-None-Match
+    to only receive what is new.
+    """
+    state = get_session(session_id)
+    transcript = state.get("transcript", [])
+    is_complete = state.get("is_interview_complete", False)
+    since = max(0, since)
+
+    # A restarted interview bumps the generation, and the question list can
+    # change without a new entry; either must invalidate a cached response
+    generation = state.get("transcript_generation", 0)
+    questions = state.get("questions", [])
+    etag = f'"{session_id}-{generation}-{len(transcript)}-{len(questions)}-{int(is_complete)}-{since}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return JSONResponse(
+        headers={"ETag": etag},
+        content={
+            "transcript": [entry_dict(entry) for entry in transcript[since:]],
+            "next_offset": len(transcript),
+            "questions": questions,
+            "is_complete": is_complete
+        },
+    )
+
+@app.get("/export")
+def export_interview(session_id: str):
+    """Stream a finished interview as JSON in the /transcript shape.
+
+    With the transcript log enabled the entries are read from it line by
+    line through its index, so a long interview (or one already evicted from
+    memory and archived) is never materialized in full.
+    """
+    transcript_log = sessions.transcript_log
+    if transcript_log is not None:
+        meta = transcript_log.locate(session_id)
+        if meta is None:
+            raise HTTPException(status_code=404, detail="Unknown session_id")
+        entries = transcript_log.iter_entries(session_id)
+    else:
+        meta = get_session(session_id)
+        entries = (entry_dict(entry) for entry in meta["transcript"])
+    if not meta.get("is_interview_complete"):
+        raise HTTPException(status_code=409, detail="Interview is not finished yet")
+
+    def body():
+        questions = json.dumps(meta.get("questions", []))
+        yield f'{{"session_id": {json.dumps(session_id)}, "questions": {questions}, "is_complete": true, "transcript": ['
+        count = 0
+        for entry in entries:
+            yield ("," if count else "") + json.dumps(entry)
+            count += 1
+        yield f'], "next_offset": {count}}}'
+
+    return StreamingResponse(
+        body(),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="interview-{session_id}.json"'},
+    )
 
 @app.post("/end_interview")
-def end_interview():
-    state["is_interview_complete"] = True
+async def end_interview(session_id: str):
+    async with sessions.lock(session_id):
+        state = await load_session(session_id)
+        state["is_interview_complete"] = True
+        await sessions.asave(session_id, state)
     return {"status": "success", "message": "Interview marked as complete"}
+
+@app.get("/tts_stats")
+def tts_stats():
+    return {
+        "cache": tts.cache.stats(),
+        "time_to_first_audio_ms": first_audio_latency.summary(),
+        "turn_gap_ms": turn_gap_latency.summary(),
+    }
+
+@app.get("/webhook_stats")
+def webhook_stats():
+    return {
+        **webhook.stats,
+        "circuit": webhook.breaker.state,
+        "latency_ms": webhook.latency.summary(),
+        "cache": webhook_cache.stats(),
+        "backend": config.DECISION_BACKEND,
+        "local": local_decision_stats(),
+    }
+
+def local_decision_stats():
+    # The in-process engine, whether it decides every turn or only stands in
+    local = getattr(decisions, "secondary", decisions)
+    if local.name != "local":
+        return None
+    return {**local.stats, "latency_ms": local.latency.summary()}
+
+@app.get("/trace")
+def get_trace(session_id: str):
+    """Stage timings (ms) of the session's most recent turns."""
+    return {"session_id": session_id, "turns": tracer.session_turns(session_id)}
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition: per-stage latency histograms plus a few gauges."""
+    cache = tts.cache.stats() if tts.cache else {}
+    gauges = {
+        "interview_tts_cache_hits_total": cache.get("hits"),
+        "interview_tts_cache_misses_total": cache.get("misses"),
+        "interview_webhook_fallbacks_total": webhook.stats.get("fallbacks"),
+        "interview_webhook_cache_hits_total": webhook_cache.hits + webhook_cache.coalesced,
+        "interview_webhook_circuit_open": int(webhook.breaker.state == "open"),
+        "interview_stt_queue_depth": stt_pool.queue.qsize() if stt_pool.queue is not None else 0,
+        "interview_stt_models_ready": int(models.is_ready()),
+    }
+    return Response(tracer.prometheus_text(gauges=gauges), media_type="text/plain; version=0.0.4")
+
+@app.get("/audio_formats")
+def audio_formats():
+    """How the browser should upload answers: "pcm16" (downsampled in the
+    browser, read without ffmpeg) or "opus" (smaller, decoded by ffmpeg)."""
+    return {
+        "preferred": config.UPLOAD_AUDIO_FORMAT,
+        "sample_rate": SAMPLE_RATE,
+        "opus_bitrate": config.UPLOAD_OPUS_BITRATE,
+    }
+
+@app.get("/health")
+def health():
+    """Liveness plus model readiness; 503 until the default Whisper model is warm."""
+    status = models.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.on_event("startup")
+def load_models():
+    models.start()
+
+@app.on_event("startup")
+async def prewarm_common_phrases():
+    tts.prewarm(config.TTS_PREWARM_PHRASES + [FALLBACK_RESPONSE])
+
+@app.on_event("shutdown")
+async def close_clients():
+    await decisions.aclose()
+    await webhook.aclose()
+    if engine is not None:
+        models.close()
+        engine.close()
+    if sessions.transcript_log is not None:
+        sessions.transcript_log.close()
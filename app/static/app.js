@@ -13,7 +13,14 @@ let waitingForFollowupAnswer = false; // New flag to track if we're waiting for
 let fullMediaRecorder = null;
 let fullRecordingBlobs = [];
 let fullMediaStream = null;
-let justTransitioned = false;
+let sessionId = null; // Issued by the server on the first /submit_custom_question
+let speechEndedAt = null; // When the last answer recording stopped, for turn-gap logging
+// How the server wants answers uploaded (GET /audio_formats); opus until it says
+let uploadFormat = { preferred: "opus", sample_rate: 16000, opus_bitrate: 32000 };
+fetch("/audio_formats")
+    .then(response => response.json())
+    .then(format => { uploadFormat = format; })
+    .catch(error => console.warn("Could not load upload formats:", error));
 
 
 
@@ -61,11 +68,13 @@ document.getElementById("startInterview").onclick = async () => {
     // ✅ Submit each question to the backend before starting
     for (const q of questions) {
         console.log("Submitting question to backend:", q);
-        await fetch("/submit_custom_question", {
+        const response = await fetch("/submit_custom_question", {
             method: "POST",
             headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ question: q }),
+            body: JSON.stringify({ question: q, session_id: sessionId }),
         });
+        const data = await response.json();
+        sessionId = data.session_id;
     }
 
     document.getElementById("startInterview").style.display = "none";
@@ -156,7 +165,9 @@ function showClosingRemarks(text) {
 let lastPlayedAudio = "";
 
 // 2. Simple speakText function with duplicate prevention
-function speakText(text, source = "unknown") {
+// `audioUrl` is the URL /answer returned for this text, whose synthesis the
+// server already started
+function speakText(text, source = "unknown", audioUrl = null) {
     // Skip if this is the same text we just played (within last 5 seconds)
     if (text === lastPlayedAudio) {
         console.log(`SKIPPING DUPLICATE AUDIO: "${text}"`);
@@ -174,23 +185,129 @@ function speakText(text, source = "unknown") {
         }
     }, 5000);
     
-    // Make the request
-    return fetch("/speak_question", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ question: text }),
-    })
-    .catch(error => {
-        console.error("Audio request error:", error);
+    // Stream the audio from the server and play it here; the <audio> element
+    // starts as soon as the first MP3 chunk arrives
+    return new Promise(resolve => {
+        const requestedAt = performance.now();
+        const params = new URLSearchParams({ question: text });
+        if (sessionId) params.set("session_id", sessionId);
+        const audio = new Audio(audioUrl || `/speak_question?${params}`);
+        audio.addEventListener("playing", () => {
+            console.log(`Time to first audio: ${Math.round(performance.now() - requestedAt)}ms`);
+            if (speechEndedAt !== null) {
+                console.log(`Turn gap (end of speech -> AI audio): ${Math.round(performance.now() - speechEndedAt)}ms`);
+                speechEndedAt = null;
+            }
+        }, { once: true });
+        audio.onended = () => resolve();
+        audio.onerror = () => {
+            console.error("Audio request error:", audio.error);
+            resolve();
+        };
+        audio.play().catch(error => {
+            console.error("Audio playback error:", error);
+            resolve();
+        });
     });
 }
 
+// POST an answer, retrying while the server's transcription queue is full (503)
+async function postAnswer(formData, attempts = 5) {
+    // Same id on every retry so the server applies this answer only once
+    if (!formData.has("request_id")) {
+        formData.append("request_id", newRequestId());
+    }
+    for (let attempt = 1; ; attempt++) {
+        const response = await fetch("/answer", { method: "POST", body: formData });
+        if (response.status !== 503 || attempt >= attempts) {
+            return response;
+        }
+        const retryAfter = parseFloat(response.headers.get("Retry-After")) || 2;
+        console.log(`Transcription queue full, retrying in ${retryAfter}s`);
+        await new Promise(resolve => setTimeout(resolve, retryAfter * 1000));
+    }
+}
+
+// The answer in the format the server asked for: 16 kHz mono PCM WAV, which it
+// reads without ffmpeg, or the recording itself with its real codec declared
+async function encodeAnswer(blob) {
+    if (uploadFormat.preferred === "pcm16" && window.OfflineAudioContext) {
+        try {
+            return { blob: await downsampleToWav(blob, uploadFormat.sample_rate), name: "answer.wav" };
+        } catch (error) {
+            console.warn("Downsampling failed, uploading the recording as is:", error);
+        }
+    }
+    return { blob, name: blob.type.includes("ogg") ? "answer.ogg" : "answer.webm" };
+}
+
+async function downsampleToWav(blob, sampleRate) {
+    const decoder = new (window.AudioContext || window.webkitAudioContext)();
+    let decoded;
+    try {
+        decoded = await decoder.decodeAudioData(await blob.arrayBuffer());
+    } finally {
+        decoder.close();
+    }
+    // Rendering into a mono context at the target rate resamples and mixes down
+    const offline = new OfflineAudioContext(1, Math.ceil(decoded.duration * sampleRate), sampleRate);
+    const source = offline.createBufferSource();
+    source.buffer = decoded;
+    source.connect(offline.destination);
+    source.start();
+    const rendered = await offline.startRendering();
+    return pcm16Wav(rendered.getChannelData(0), sampleRate);
+}
+
+function pcm16Wav(samples, sampleRate) {
+    const view = new DataView(new ArrayBuffer(44 + samples.length * 2));
+    const writeText = (offset, text) => {
+        for (let i = 0; i < text.length; i++) view.setUint8(offset + i, text.charCodeAt(i));
+    };
+    writeText(0, "RIFF");
+    view.setUint32(4, 36 + samples.length * 2, true);
+    writeText(8, "WAVE");
+    writeText(12, "fmt ");
+    view.setUint32(16, 16, true);             // fmt chunk size
+    view.setUint16(20, 1, true);              // PCM
+    view.setUint16(22, 1, true);              // mono
+    view.setUint32(24, sampleRate, true);
+    view.setUint32(28, sampleRate * 2, true); // byte rate
+    view.setUint16(32, 2, true);              // block align
+    view.setUint16(34, 16, true);             // bits per sample
+    writeText(36, "data");
+    view.setUint32(40, samples.length * 2, true);
+    for (let i = 0; i < samples.length; i++) {
+        const s = Math.max(-1, Math.min(1, samples[i]));
+        view.setInt16(44 + i * 2, s < 0 ? s * 0x8000 : s * 0x7fff, true);
+    }
+    return new Blob([view.buffer], { type: "audio/wav" });
+}
+
+// Opus in whichever container this browser records; a low bitrate when the
+// recording itself is what gets uploaded
+function recorderOptions() {
+    const options = {};
+    const mimeType = ["audio/webm;codecs=opus", "audio/ogg;codecs=opus"]
+        .find(type => MediaRecorder.isTypeSupported && MediaRecorder.isTypeSupported(type));
+    if (mimeType) options.mimeType = mimeType;
+    if (uploadFormat.preferred === "opus") options.audioBitsPerSecond = uploadFormat.opus_bitrate;
+    return options;
+}
+
+function newRequestId() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
 // 3. Handle welcome message only once
 let welcomeMessagePlayed = false;
 
 // 4. Completely rewritten processNextQuestion
 
-async function processNextQuestion() {
+async function processNextQuestion(audioUrl = null) {
     console.log("Running processNextQuestion");
 
     if (isInterviewComplete) {
@@ -219,26 +336,32 @@ async function processNextQuestion() {
         updateProgressTracker(currentQuestionIndex + 1, interviewData.questions.length);
     }
 
-    // ✅ Speak the question if it's a follow-up or not just transitioned
-    if (isFollowUp || !justTransitioned) {
-        await speakText(currentQuestionText, isFollowUp ? "follow-up" : "question");
-    } else {
-        console.log("[TTS] Skipping speaking question due to justTransitioned flag");
-        justTransitioned = false;  // ✅ Reset after skipping
-    }
+    // ✅ Speak the question (prefetched by the server when /answer gave its URL)
+    await speakText(currentQuestionText, isFollowUp ? "follow-up" : "question", audioUrl);
 
     // ✅ THEN start recording
-    recordAudioWithSilenceDetection().then(audioBlob => {
+    recordAudioWithSilenceDetection().then(async ({ audioBlob, streamed }) => {
         const formData = new FormData();
-        formData.append("file", audioBlob, "answer.wav");
+        if (streamed) {
+            // The server already has the text from /ws/answer
+            formData.append("streamed", "true");
+        } else {
+            const upload = await encodeAnswer(audioBlob);
+            formData.append("file", upload.blob, upload.name);
+        }
         formData.append("is_followup", isFollowUp);
-        return fetch("/answer", {
-            method: "POST",
-            body: formData
-        });
+        formData.append("session_id", sessionId);
+        return postAnswer(formData);
     })
     .then(response => response.json())
     .then(data => {
+        if (data.error && data.transcript === null) {
+            // Nothing was recorded for this turn (unreadable audio, server busy): ask again
+            console.warn("Answer not accepted:", data.error);
+            document.getElementById("recordingStatus").textContent = data.error;
+            setTimeout(() => processNextQuestion(), 1500);
+            return;
+        }
         if (isFollowUp) {
             interviewData.followupAnswers.push(data.transcript);
             addToTranscriptList("You (Follow-up response)", data.transcript);
@@ -252,7 +375,7 @@ async function processNextQuestion() {
             if (data.followup) {
                 addToTranscriptList("Interviewer (Closing)", data.followup);
                 showClosingRemarks(data.followup);
-                speakText(data.followup, "closing");
+                speakText(data.followup, "closing", data.followup_audio_url);
                 setTimeout(() => {
                     isInterviewComplete = true;
                     endInterview();
@@ -269,7 +392,7 @@ async function processNextQuestion() {
             interviewData.followups.push(data.followup);
             addToTranscriptList("Interviewer (Follow-up)", data.followup);
             waitingForFollowupAnswer = true;
-            setTimeout(() => processNextQuestion(), 100);
+            setTimeout(() => processNextQuestion(data.followup_audio_url), 100);
             return;
         } else {
             if (data.followup) {
@@ -280,9 +403,9 @@ async function processNextQuestion() {
                     currentQuestionIndex = data.next_question;
                 }
 
-                justTransitioned = true; // ✅ Transition line was just spoken
-                speakText(data.followup, "transition").then(() => {
-                    setTimeout(() => processNextQuestion(), 100);
+                // ✅ Transition line first, then the next question
+                speakText(data.followup, "transition", data.followup_audio_url).then(() => {
+                    setTimeout(() => processNextQuestion(data.next_question_audio_url), 100);
                 });
 
                 return;
@@ -291,8 +414,7 @@ async function processNextQuestion() {
 
         if (data.next_question !== null && data.next_question !== undefined) {
             currentQuestionIndex = data.next_question;
-            justTransitioned = false;  // Just in case
-            setTimeout(() => processNextQuestion(), 100);
+            setTimeout(() => processNextQuestion(data.next_question_audio_url), 100);
         } else {
             isInterviewComplete = true;
             endInterview();
@@ -377,7 +499,7 @@ function endInterview() {
     stopAndShowRecording();
 
     // Tell the server to officially end the interview
-    fetch("/end_interview", {
+    fetch(`/end_interview?session_id=${encodeURIComponent(sessionId)}`, {
         method: "POST"
     });
 
@@ -404,7 +526,7 @@ function displayFullTranscript() {
     transcriptContainer.appendChild(headerElement);
     
     // Get transcript from API to ensure we have the complete one
-    fetch("/transcript")
+    fetch(`/transcript?session_id=${encodeURIComponent(sessionId)}`)
         .then(response => response.json())
         .then(data => {
             // Check if there's an official transcript
@@ -534,12 +656,55 @@ function downloadTranscriptAsText() {
     URL.revokeObjectURL(url);
 }
 
+// Stream answer audio to /ws/answer while recording so transcription runs
+// alongside the candidate instead of after they stop talking.
+// `mimeType` is the recorder's format, so the server can skip format probing.
+function openTranscriptionSocket(mimeType) {
+    const protocol = location.protocol === "https:" ? "wss:" : "ws:";
+    let url = `${protocol}//${location.host}/ws/answer?session_id=${encodeURIComponent(sessionId)}`;
+    if (mimeType) url += `&mime=${encodeURIComponent(mimeType)}`;
+    const socket = new WebSocket(url);
+    let failed = false;
+    const pending = [];
+    let resolveFinal = null;
+
+    socket.onopen = () => pending.splice(0).forEach(chunk => socket.send(chunk));
+    socket.onerror = () => { failed = true; if (resolveFinal) resolveFinal(false); };
+    socket.onclose = () => { if (resolveFinal) resolveFinal(false); };
+    socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === "partial") {
+            document.getElementById("recordingStatus").textContent = `Recording... ${message.text}`;
+        } else if (message.type === "final" && resolveFinal) {
+            resolveFinal(true);
+        }
+    };
+
+    return {
+        send(chunk) {
+            if (failed) return;
+            if (socket.readyState === WebSocket.OPEN) socket.send(chunk);
+            else pending.push(chunk);
+        },
+        // Resolves true once the server has the final text, false if we must upload instead
+        finish() {
+            if (failed || socket.readyState === WebSocket.CLOSED) return Promise.resolve(false);
+            return new Promise(resolve => {
+                resolveFinal = (ok) => { resolveFinal = null; resolve(ok); };
+                const sendEnd = () => { pending.splice(0).forEach(c => socket.send(c)); socket.send("end"); };
+                if (socket.readyState === WebSocket.OPEN) sendEnd();
+                else socket.addEventListener("open", sendEnd);
+            }).then(ok => { socket.close(); return ok; });
+        }
+    };
+}
+
 function recordAudioWithSilenceDetection() {
     return new Promise(async (resolve) => {
         const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
         audioStream = stream; // Store stream globally so we can stop it later
-        
-        mediaRecorder = new MediaRecorder(stream);
+        mediaRecorder = new MediaRecorder(stream, recorderOptions());
+        const transcriptionSocket = openTranscriptionSocket(mediaRecorder.mimeType);
         const chunks = [];
         let silenceTimer = null;
         let lastAudioLevel = 0;
@@ -589,21 +754,26 @@ function recordAudioWithSilenceDetection() {
         // Start checking for silence
         const silenceCheckInterval = setInterval(checkForSilence, 16);
         
-        mediaRecorder.ondataavailable = e => chunks.push(e.data);
+        mediaRecorder.ondataavailable = e => {
+            chunks.push(e.data);
+            transcriptionSocket.send(e.data);
+        };
         
-        mediaRecorder.onstop = () => {
+        mediaRecorder.onstop = async () => {
+            speechEndedAt = performance.now();
             clearInterval(silenceCheckInterval);
             audioContext.close();
             
             // Stop all tracks
             stream.getTracks().forEach(track => track.stop());
             
-            resolve(new Blob(chunks, { type: 'audio/wav' }));
+            const streamed = await transcriptionSocket.finish();
+            resolve({ audioBlob: new Blob(chunks, { type: mediaRecorder.mimeType || 'audio/webm' }), streamed });
         };
         
-        // Start recording
+        // Start recording, emitting a chunk every 250ms for the streaming transcriber
         document.getElementById("recordingStatus").textContent = "Recording...";
-        mediaRecorder.start();
+        mediaRecorder.start(250);
         
         // Also set a maximum recording time (60 seconds)
         setTimeout(() => {
@@ -0,0 +1,36 @@
+# Offline transcription of recorded interviews (the full webm recordings from
+# the browser, or any audio/video ffmpeg can read).
+#
+#   python batch_transcribe.py recordings/ transcripts/ --workers 8 --model base
+#
+# Writes one JSON per recording, mirroring the input tree, in the same shape
+# GET /transcript returns. Rerunning skips finished recordings and resumes
+# unfinished ones from their checkpoint.
+
+import argparse
+
+from interview_logic import config
+from interview_logic.STT.batch import run_batch
+from interview_logic.STT.model_manager import VARIANTS
+from interview_logic.utils.logs import setup_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe a directory of recorded interviews.")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--model", default="base", choices=sorted(VARIANTS), help="Whisper variant")
+    parser.add_argument("--turn-gap", type=float, default=2.5, help="seconds of silence that end a turn")
+    args = parser.parse_args()
+
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT)
+    model_name, quantize = VARIANTS[args.model]
+    summary = run_batch(args.input_dir, args.output_dir, args.workers, model_name, quantize, args.turn_gap)
+    print(f"Processed {summary['processed']} recordings, {len(summary['failed'])} failed")
+    for path in summary["failed"]:
+        print(f"  failed: {path}")
+
+
+if __name__ == "__main__":
+    main()
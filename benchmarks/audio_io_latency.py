@@ -0,0 +1,115 @@
+"""Micro-benchmark: temp-file audio handling vs the in-memory ffmpeg pipe.
+
+STT path: upload bytes -> (temp .wav file + whisper.load_audio) vs
+decode_audio_bytes, optionally followed by Whisper so the number is
+bytes-in to text-out.
+TTS path: MP3 bytes -> (mp3 temp + pydub WAV export + re-read) vs
+decode_pcm16 straight to a playable buffer.
+
+    python benchmarks/audio_io_latency.py --runs 20
+    python benchmarks/audio_io_latency.py --runs 5 --whisper-model tiny
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from interview_logic.utils.audio_io import decode_audio_bytes, decode_pcm16
+
+
+def encode(samples, samplerate, fmt):
+    # Produce fixture bytes in the same container the real paths receive
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-f", "s16le", "-ar", str(samplerate),
+           "-ac", "1", "-i", "pipe:0", "-f", fmt, "pipe:1"]
+    return subprocess.run(cmd, input=samples.tobytes(), capture_output=True, check=True).stdout
+
+
+def synthetic_speech(seconds, samplerate):
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    envelope = (np.sin(2 * np.pi * 3 * t) > 0).astype(np.float32)
+    tone = np.sin(2 * np.pi * 220 * t) + 0.5 * np.sin(2 * np.pi * 440 * t)
+    return (tone * envelope * 8000).astype(np.int16)
+
+
+def stt_tempfile(data, model):
+    import whisper
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
+        tmp.write(data)
+        path = tmp.name
+    try:
+        audio = whisper.load_audio(path)
+        return model.transcribe(audio)["text"] if model else audio
+    finally:
+        os.remove(path)
+
+
+def stt_memory(data, model):
+    audio = decode_audio_bytes(data)
+    return model.transcribe(audio)["text"] if model else audio
+
+
+def tts_tempfile(mp3_bytes):
+    from pydub import AudioSegment
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as mp3_tmp:
+        mp3_tmp.write(mp3_bytes)
+        mp3_path = mp3_tmp.name
+    wav_path = mp3_path.replace(".mp3", ".wav")
+    try:
+        AudioSegment.from_file(mp3_path).export(wav_path, format="wav")
+        with wave.open(wav_path, "rb") as wav:
+            return wav.readframes(wav.getnframes())
+    finally:
+        os.remove(mp3_path)
+        os.remove(wav_path)
+
+
+def tts_memory(mp3_bytes):
+    return decode_pcm16(mp3_bytes, 24000).tobytes()
+
+
+def timeit(fn, *args, runs):
+    fn(*args)  # warm-up
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of the synthetic answer")
+    parser.add_argument("--whisper-model", default=None, help="Also run Whisper (e.g. tiny) for bytes-in to text-out")
+    args = parser.parse_args()
+
+    model = None
+    if args.whisper_model:
+        import whisper
+        model = whisper.load_model(args.whisper_model)
+
+    answer = encode(synthetic_speech(args.seconds, 48000), 48000, "wav")
+    prompt = encode(synthetic_speech(4.0, 24000), 24000, "mp3")
+
+    rows = [
+        ("STT temp file", timeit(stt_tempfile, answer, model, runs=args.runs)),
+        ("STT in memory", timeit(stt_memory, answer, model, runs=args.runs)),
+        ("TTS temp files", timeit(tts_tempfile, prompt, runs=args.runs)),
+        ("TTS in memory", timeit(tts_memory, prompt, runs=args.runs)),
+    ]
+    print(f"{'path':<16}{'median ms':>12}{'max ms':>10}")
+    for name, (median, worst) in rows:
+        print(f"{name:<16}{median:>12.1f}{worst:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
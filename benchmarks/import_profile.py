@@ -0,0 +1,147 @@
+"""Import-time profile of the API process: what each module costs at startup.
+
+Imports the target module (api by default) in fresh interpreters under
+`python -X importtime` and reports, as the median over --runs:
+
+  wall_ms      time to import the module
+  rss_mb       peak resident memory right after the import
+  packages_ms  self time summed per top-level package (fastapi, numpy, ...)
+  slowest      modules with the largest self / cumulative time
+  heavy        which of the engine dependencies (torch, whisper, edge_tts,
+               pydub, simpleaudio) got imported at all
+
+Pass --env to profile a startup mode, save a run with --output and check a
+later one against it with --compare; --budget-ms makes the script exit 1
+when the import is slower, so it can guard CI:
+
+    python benchmarks/import_profile.py --env ENGINE_MODE=remote --output before.json
+    python benchmarks/import_profile.py --env ENGINE_MODE=remote --compare before.json --budget-ms 1000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY = ("torch", "whisper", "edge_tts", "aiohttp", "pydub", "simpleaudio", "numpy", "httpx", "fastapi")
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+wall_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "wall_ms": wall_ms,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us, depth)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(fields[0]), int(fields[1]), depth)
+    return modules
+
+
+def profile_once(module, env):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module, heavy=HEAVY)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    summary = json.loads(proc.stdout.strip().splitlines()[-1])
+    return summary, parse_importtime(proc.stderr)
+
+
+def profile(module, env, runs, top):
+    summaries, profiles = [], []
+    for _ in range(runs):
+        summary, modules = profile_once(module, env)
+        summaries.append(summary)
+        profiles.append(modules)
+
+    def median(values):
+        return round(statistics.median(values), 1)
+
+    names = set.intersection(*(set(p) for p in profiles))
+    self_ms = {name: median([p[name][0] / 1000 for p in profiles]) for name in names}
+    cumulative_ms = {name: median([p[name][1] / 1000 for p in profiles]) for name in names}
+    packages = defaultdict(float)
+    for name, ms in self_ms.items():
+        packages[name.split(".")[0]] += ms
+
+    return {
+        "module": module,
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "wall_ms": median([s["wall_ms"] for s in summaries]),
+        "rss_mb": median([s["rss_mb"] for s in summaries]),
+        "modules_imported": len(names),
+        "heavy": summaries[-1]["loaded"],
+        "packages_ms": {name: round(ms, 1) for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:top]},
+        "slowest_self_ms": dict(sorted(self_ms.items(), key=lambda kv: -kv[1])[:top]),
+        "slowest_cumulative_ms": dict(sorted(cumulative_ms.items(), key=lambda kv: -kv[1])[:top]),
+    }
+
+
+def compare(result, baseline):
+    """Print wall time and per-package changes vs a saved run."""
+    def change(new, old):
+        return f"{100 * (new - old) / old:+.1f}%" if old else "n/a"
+
+    print(f"\nvs baseline: import {baseline['wall_ms']} -> {result['wall_ms']} ms "
+          f"({change(result['wall_ms'], baseline['wall_ms'])}), RSS {baseline['rss_mb']} -> {result['rss_mb']} MB")
+    for name in sorted(set(result["heavy"]) - set(baseline["heavy"])):
+        print(f"  now imports {name}")
+    old_packages = baseline.get("packages_ms", {})
+    for name, ms in result["packages_ms"].items():
+        old = old_packages.get(name, 0.0)
+        if ms - old >= 5:
+            print(f"  {name:<28} {old:>8} -> {ms:>8} ms ({change(ms, old)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="api", help="module to import (from the repo root)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra environment, repeatable")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--output", help="write the JSON result to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --output")
+    parser.add_argument("--budget-ms", type=float, help="exit 1 if the import takes longer than this")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    env.update(item.split("=", 1) for item in args.env)
+
+    result = profile(args.module, env, args.runs, args.top)
+    result["env"] = args.env
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+    if args.budget_ms is not None and result["wall_ms"] > args.budget_ms:
+        print(f"\nimport of {args.module} took {result['wall_ms']} ms, over the {args.budget_ms} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Drive N concurrent synthetic interview sessions through the API.
+
+By default the FastAPI app runs in-process with stub STT, TTS and webhook
+backends so only the session/HTTP layer is measured. Pass --url to hit a
+running uvicorn deployment (real models, real webhook) instead.
+
+    python benchmarks/load_sessions.py --sessions 200 --questions 3
+    python benchmarks/load_sessions.py --url http://127.0.0.1:8000 --sessions 20
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+import wave
+
+import httpx
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from interview_logic.LLM.decision_backend import DecisionBackend
+from interview_logic.utils.vad import SAMPLE_RATE
+from vad_trimming import synthetic_speech
+
+
+def make_wav(seed, seconds=2.0, pad_seconds=0.3):
+    """A speech-like answer with a little silence around it. An all-silent
+    upload would be dropped by VAD and never reach the STT pool."""
+    rng = np.random.default_rng(seed)
+    pad = np.zeros(int(pad_seconds * SAMPLE_RATE), np.float32)
+    audio = np.concatenate([pad, synthetic_speech(rng, seconds), pad])
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+class StubSTT:
+    clips = 0
+
+    def transcribe(self, audio):
+        StubSTT.clips += 1
+        return "I improved the service latency by adding a cache."
+
+    def transcribe_batch(self, audios):
+        return [self.transcribe(audio) for audio in audios]
+
+
+class StubModels:
+    """Stands in for api.models: one always-ready stub variant."""
+
+    def __init__(self):
+        self.stt = StubSTT()
+
+    def start(self):
+        pass
+
+    def is_ready(self):
+        return True
+
+    def loaded_count(self):
+        return 1
+
+    def get(self, variant=None):
+        return self.stt
+
+    def choose(self, latency_budget_ms=None, audio_seconds=0.0):
+        return "stub"
+
+    def record(self, variant, audio_seconds, inference_ms):
+        pass
+
+    def status(self):
+        return {"ready": True, "default": "stub", "variants": {"stub": {"state": "ready"}}}
+
+
+class StubTTS:
+    cache = None
+
+    async def speak(self, text):
+        return None
+
+    def prewarm(self, texts):
+        pass
+
+    def cancel_prewarm(self, texts):
+        pass
+
+    async def stream(self, text):
+        yield b""
+
+
+class StubWebhook(DecisionBackend):
+    name = "stub"
+
+    async def post(self, payload):
+        return self.output(False, "Thanks, let's move on.")
+
+
+def build_client(url):
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=120)
+
+    os.chdir(REPO_ROOT)  # api.py mounts app/static relative to the cwd
+    import api
+    api.models = StubModels()
+    api.tts = StubTTS()
+    # /answer asks api.decisions, which wraps the webhook it was built with
+    api.webhook = api.decisions = StubWebhook()
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench", timeout=120)
+
+
+async def run_session(client, n_questions, clips, latencies, rejected):
+    session_id = None
+    for i in range(n_questions):
+        r = await client.post("/submit_custom_question", json={"question": f"Question {i + 1}?", "session_id": session_id})
+        session_id = r.json()["session_id"]
+
+    for i in range(n_questions):
+        audio = clips[i % len(clips)]
+        started = time.perf_counter()
+        while True:
+            r = await client.post(
+                "/answer",
+                files={"file": ("answer.wav", audio, "audio/wav")},
+                data={"is_followup": "false", "session_id": session_id},
+            )
+            if r.status_code != 503:
+                break
+            rejected.append(session_id)
+            await asyncio.sleep(float(r.headers.get("Retry-After", "1")) / 10)
+        latencies.append(time.perf_counter() - started)
+        if r.json().get("interview_complete"):
+            break
+
+    r = await client.get("/transcript", params={"session_id": session_id})
+    return len(r.json()["transcript"])
+
+
+async def main_async(args):
+    clips = [make_wav(seed) for seed in range(8)]
+    latencies = []
+    rejected = []
+    async with build_client(args.url) as client:
+        started = time.perf_counter()
+        entries = await asyncio.gather(
+            *[run_session(client, args.questions, clips, latencies, rejected) for _ in range(args.sessions)]
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Sessions: {args.sessions}  questions/session: {args.questions}")
+    print(f"Transcript entries per session: min={min(entries)} max={max(entries)}")
+    print(f"Total time: {elapsed:.2f}s  /answer calls: {len(latencies)}  ({len(latencies) / elapsed:.1f} req/s)")
+    print(f"503 (queue full) responses retried: {len(rejected)}")
+    if args.url is None:
+        print(f"Clips transcribed by the stub STT: {StubSTT.clips}")
+    print(f"/answer latency p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms "
+          f"max={latencies[-1] * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process app)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
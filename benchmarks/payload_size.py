@@ -0,0 +1,81 @@
+"""Webhook payload bytes and tokens per turn for each PayloadBuilder mode.
+
+Each TEST_CASES scenario from call_n8n_tester.py is extended to --turns
+/answer calls by replaying its question / answer / follow-up texts (and the
+other scenarios') in the transcript shape api.py produces.
+
+    python benchmarks/payload_size.py --turns 60 --budget 1500
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from call_n8n_tester import TEST_CASES
+from interview_logic.LLM.payload_builder import PayloadBuilder, count_tokens
+
+
+def scenario_texts(scenario_id):
+    # Start with the chosen scenario, then borrow from the rest for variety
+    ordered = [scenario_id] + [k for k in TEST_CASES if k != scenario_id]
+    rounds = []
+    for key in ordered:
+        entries = TEST_CASES[key]["transcript"]
+        rounds.append([entry["text"] for entry in entries])
+    return rounds
+
+
+def simulate(scenario_id, turns, builder):
+    rounds = scenario_texts(scenario_id)
+    questions = [{"question": f"Question {i + 1}: {rounds[i % len(rounds)][0]}"} for i in range(turns)]
+    state = {"questions": questions, "transcript": [], "index": 0}
+    rows = []
+    for turn in range(turns):
+        question, answer, followup, followup_answer = rounds[turn % len(rounds)]
+        index = state["index"]
+        if turn % 2 == 0:
+            # question + answer, the webhook asks a follow-up
+            state["transcript"].append({"speaker": "AI", "text": questions[index]["question"], "question_number": index + 1})
+            state["transcript"].append({"speaker": "Human", "text": answer})
+        else:
+            state["transcript"].append({"speaker": "Human", "text": followup_answer, "is_followup_answer": True})
+
+        payload = builder.build(state, index)
+        body = json.dumps(payload).encode("utf-8")
+        rows.append((len(body), len(gzip.compress(body, compresslevel=5)), count_tokens(body.decode("utf-8"))))
+        builder.mark_sent(state)
+
+        if turn % 2 == 0:
+            state["transcript"].append({"speaker": "AI", "text": followup, "is_followup": True})
+        else:
+            state["index"] += 1
+            state["transcript"].append({"speaker": "AI", "text": "Thanks. Let's move on.", "transition_to": index + 2})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--budget", type=int, default=1500)
+    args = parser.parse_args()
+
+    for scenario_id in TEST_CASES:
+        print(f"\nScenario {scenario_id} ({args.turns} turns)")
+        print(f"{'mode':<8}{'turn':>6}{'bytes':>10}{'gzip':>8}{'tokens':>8}")
+        totals = {}
+        for mode in ("full", "budget", "delta"):
+            rows = simulate(scenario_id, args.turns, PayloadBuilder(mode=mode, token_budget=args.budget))
+            for turn in (1, 10, 25, args.turns):
+                if turn <= len(rows):
+                    raw, zipped, tokens = rows[turn - 1]
+                    print(f"{mode:<8}{turn:>6}{raw:>10}{zipped:>8}{tokens:>8}")
+            totals[mode] = [sum(column) for column in zip(*rows)]
+        for mode, (raw, zipped, tokens) in totals.items():
+            print(f"  total {mode:<7} bytes={raw:>9} gzip={zipped:>8} tokens={tokens:>8}")
+
+
+if __name__ == "__main__":
+    main()
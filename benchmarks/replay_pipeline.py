@@ -0,0 +1,378 @@
+"""Replay interview conversations through the full /answer pipeline in-process.
+
+Every session registers its questions, then for each turn uploads a
+synthesized WAV answer to /answer and downloads the reply audio from the
+returned URL, the way app.js does. Conversations come from the TEST_CASES
+scenarios in call_n8n_tester.py (one per scenario, rotated across sessions)
+or are generated with --questions / --followups for longer interviews.
+
+The real FastAPI app, session store, VAD, transcription pool, payload
+builder and WebhookClient all run. Only the backends are stubbed:
+
+  STT      returns corpus words in proportion to the speech it is given,
+           after sleeping --stt-ms-per-second per second of audio
+  webhook  WebhookClient talks to an in-memory transport that replays the
+           scripted follow-ups / transitions after --webhook-ms
+  TTS      streams bytes after --tts-first-ms
+
+Swap any of them for the real thing with --real stt,tts and/or
+--webhook-url (e.g. benchmarks/webhook_stub.py --serve, or n8n itself).
+--decision-backend local decides turns in process instead (see
+interview_logic/LLM/decision_backend.py); compare its "decision" stage with
+a webhook run.
+Answers are uploaded the way the browser client does by default: 16 kHz
+mono PCM WAV, which /answer reads without ffmpeg (see upload_formats.py for
+the other upload formats).
+
+Reports requests/sec, p50/p95/p99 per traced stage (see /trace) plus the
+client-side /answer and reply-audio times, and RSS growth. Save with
+--output and compare two runs with --compare:
+
+    python benchmarks/replay_pipeline.py --sessions 50 --output before.json
+    python benchmarks/replay_pipeline.py --sessions 50 --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import sys
+import time
+import wave
+from collections import defaultdict, deque
+
+import httpx
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from call_n8n_tester import QUESTIONS, TEST_CASES
+from load_sessions import StubModels
+from vad_trimming import synthetic_speech
+from interview_logic.LLM.decision_backend import BACKENDS, create_decision_backend
+from interview_logic.utils.audio_io import SAMPLE_RATE
+
+WORDS_PER_SECOND = 2.5
+TRANSITION = "Thanks for that. Let's move on to the next question."
+CORPUS = " ".join(entry["text"] for case in TEST_CASES.values() for entry in case["transcript"]
+                  if entry["speaker"] == "Human").split()
+
+
+def rss_mb(field="VmRSS"):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def percentiles(values):
+    if not values:
+        return None
+    ordered = np.sort(np.asarray(values, dtype=np.float64))
+    p50, p95, p99 = np.percentile(ordered, [50, 95, 99])
+    return {"count": len(ordered), "p50": round(p50, 1), "p95": round(p95, 1), "p99": round(p99, 1),
+            "max": round(float(ordered[-1]), 1)}
+
+
+# --- conversations -------------------------------------------------------
+
+def case_rounds():
+    """(question, answer, follow-up, follow-up answer) from each scenario."""
+    rounds = []
+    for case in TEST_CASES.values():
+        rounds.append(tuple(entry["text"] for entry in case["transcript"][:4]))
+    return rounds
+
+
+def build_conversations(sessions, questions=None, followups=1):
+    """One script per session: a list of question blocks, each with the
+    candidate's answers and the webhook decisions that follow them."""
+    rounds = case_rounds()
+    conversations = []
+    for s in range(sessions):
+        n_questions = questions or len(QUESTIONS)
+        blocks = []
+        for q in range(n_questions):
+            question, answer, followup, followup_answer = rounds[(s + q) % len(rounds)]
+            # Tag questions per session so the webhook stub can tell them apart
+            blocks.append({
+                "question": f"[S{s}-Q{q + 1}] {question}",
+                "answers": [answer] + [followup_answer] * followups,
+                "decisions": [{"is_follow_up": True, "response": followup}] * followups
+                + [{"is_follow_up": False, "response": TRANSITION}],
+            })
+        conversations.append(blocks)
+    return conversations
+
+
+# --- audio fixtures ------------------------------------------------------
+
+def wav_bytes(audio):
+    pcm = (np.clip(audio, -1, 1) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+class Fixtures:
+    """Synthesized answer recordings: speech-like audio as long as the text
+    would take to say, with pauses and the trailing silence the browser's
+    silence detector leaves. Cached by rounded duration."""
+
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+        self.cache = {}
+
+    def for_text(self, text):
+        seconds = int(min(60, max(2, len(text.split()) / WORDS_PER_SECOND)))
+        if seconds not in self.cache:
+            noise = lambda s: self.rng.normal(0, 0.003, int(s * SAMPLE_RATE)).astype(np.float32)
+            parts, remaining = [noise(1.0)], seconds
+            while remaining > 0:
+                burst = min(remaining, float(self.rng.uniform(4, 10)))
+                parts += [synthetic_speech(self.rng, burst), noise(0.6)]
+                remaining -= burst
+            parts.append(noise(3.0))
+            audio = np.concatenate(parts)
+            # Room noise runs under the speech too, as in vad_trimming.py
+            self.cache[seconds] = wav_bytes(audio + noise(len(audio) / SAMPLE_RATE))
+        return self.cache[seconds]
+
+
+# --- stub backends -------------------------------------------------------
+
+class ReplaySTT:
+    def __init__(self, ms_per_second):
+        self.ms_per_second = ms_per_second
+        self.offset = 0
+
+    def transcribe_batch(self, audios):
+        seconds = [len(audio) / SAMPLE_RATE for audio in audios]
+        time.sleep(self.ms_per_second * sum(seconds) / 1000)
+        return [self._words(s) for s in seconds]
+
+    def transcribe(self, audio):
+        return self.transcribe_batch([audio])[0]
+
+    def _words(self, seconds):
+        n = max(1, int(seconds * WORDS_PER_SECOND))
+        start = self.offset % len(CORPUS)
+        self.offset += n
+        return " ".join((CORPUS * 2)[start:start + n])
+
+
+class ReplayModels(StubModels):
+    def __init__(self, stt):
+        self.stt = stt
+
+
+class StubTTS:
+    cache = None
+
+    def __init__(self, first_ms, bytes_per_char=120, chunk_bytes=4096):
+        self.first_ms = first_ms
+        self.bytes_per_char = bytes_per_char
+        self.chunk_bytes = chunk_bytes
+
+    def prewarm(self, texts):
+        pass
+
+    def cancel_prewarm(self, texts):
+        pass
+
+    async def stream(self, text):
+        await asyncio.sleep(self.first_ms / 1000)
+        remaining = len(text) * self.bytes_per_char
+        while remaining > 0:
+            yield b"\0" * min(remaining, self.chunk_bytes)
+            remaining -= self.chunk_bytes
+            await asyncio.sleep(0)
+
+
+def scripted_webhook(conversations, latency_ms):
+    """httpx transport answering like the n8n workflow, from the scripts."""
+    decisions = {block["question"]: deque(block["decisions"]) for blocks in conversations for block in blocks}
+
+    async def handler(request):
+        payload = json.loads(request.content)
+        question = payload.get("current_question_text") or payload["questions"][payload["current_question"] - 1]
+        await asyncio.sleep(latency_ms / 1000)
+        script = decisions.get(question)
+        decision = script.popleft() if script else {"is_follow_up": False, "response": TRANSITION}
+        return httpx.Response(200, json={"output": json.dumps(decision)})
+
+    return httpx.MockTransport(handler)
+
+
+# --- driver --------------------------------------------------------------
+
+async def run_session(client, blocks, fixtures, client_ms, counts):
+    session_id = None
+    for block in blocks:
+        r = await client.post("/submit_custom_question", json={"question": block["question"], "session_id": session_id})
+        session_id = r.json()["session_id"]
+
+    for block in blocks:
+        for i, answer in enumerate(block["answers"]):
+            started = time.perf_counter()
+            while True:
+                r = await client.post(
+                    "/answer",
+                    files={"file": ("answer.wav", fixtures.for_text(answer), "audio/wav")},
+                    data={"is_followup": str(i > 0).lower(), "session_id": session_id},
+                )
+                if r.status_code != 503:
+                    break
+                counts["retried_503"] += 1
+                await asyncio.sleep(float(r.headers.get("Retry-After", "1")) / 10)
+            client_ms["answer_http"].append((time.perf_counter() - started) * 1000)
+            counts["answers"] += 1
+            body = r.json()
+            if body.get("error"):
+                counts["errors"] += 1
+
+            if body.get("followup_audio_url"):
+                started = time.perf_counter()
+                async with client.stream("GET", body["followup_audio_url"]) as audio:
+                    async for _ in audio.aiter_bytes():
+                        pass
+                client_ms["reply_audio_http"].append((time.perf_counter() - started) * 1000)
+            if body.get("interview_complete"):
+                return session_id
+            if not body.get("is_follow_up"):
+                break  # the webhook moved on early
+    return session_id
+
+
+async def run(args):
+    os.chdir(REPO_ROOT)  # api.py mounts app/static relative to the cwd
+    import api
+
+    real = set(filter(None, args.real.split(",")))
+    conversations = build_conversations(args.sessions, args.questions, args.followups)
+    if "stt" in real:
+        api.models.preload()
+    else:
+        api.models = ReplayModels(ReplaySTT(args.stt_ms_per_second))
+    if "tts" not in real:
+        api.tts = StubTTS(args.tts_first_ms)
+    if args.webhook_url:
+        api.webhook.url = args.webhook_url
+    else:
+        api.webhook._client = httpx.AsyncClient(transport=scripted_webhook(conversations, args.webhook_ms))
+    if args.decision_backend != "webhook":
+        api.decisions = create_decision_backend(args.decision_backend, api.webhook)
+
+    fixtures = Fixtures()
+    for blocks in conversations:
+        for block in blocks:
+            for answer in block["answers"]:
+                fixtures.for_text(answer)
+
+    client_ms = defaultdict(list)
+    counts = defaultdict(int)
+    rss_start = rss_mb()
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(blocks):
+            async with semaphore:
+                return await run_session(client, blocks, fixtures, client_ms, counts)
+
+        started = time.perf_counter()
+        session_ids = await asyncio.gather(*[one(blocks) for blocks in conversations])
+        elapsed = time.perf_counter() - started
+
+        transcript_entries = []
+        for session_id in session_ids:
+            r = await client.get("/transcript", params={"session_id": session_id})
+            transcript_entries.append(len(r.json()["transcript"]))
+    await api.webhook.aclose()
+
+    stage_ms = defaultdict(list)
+    for session_id in session_ids:
+        for turn in api.tracer.session_turns(session_id):
+            stage_ms["turn_total"].append(turn["total_ms"])
+            for stage, ms in turn["spans_ms"].items():
+                stage_ms[stage].append(ms)
+
+    rss_end = rss_mb()
+    return {
+        "config": {**vars(args), "python": platform.python_version()},
+        "sessions": args.sessions,
+        "answers": counts["answers"],
+        "errors": counts["errors"],
+        "retried_503": counts["retried_503"],
+        "transcript_entries": {"min": min(transcript_entries), "max": max(transcript_entries)},
+        "elapsed_s": round(elapsed, 2),
+        "answers_per_s": round(counts["answers"] / elapsed, 2),
+        "stages_ms": {stage: percentiles(values) for stage, values in sorted(stage_ms.items())},
+        "client_ms": {name: percentiles(values) for name, values in sorted(client_ms.items())},
+        "memory_mb": {
+            "rss_start": rss_start,
+            "rss_end": rss_end,
+            "rss_peak": rss_mb("VmHWM"),
+            "growth": round(rss_end - rss_start, 1) if rss_start and rss_end else None,
+            "growth_per_session_kb": round((rss_end - rss_start) * 1024 / args.sessions, 1) if rss_start and rss_end else None,
+        },
+    }
+
+
+def compare(result, baseline):
+    """Print the relative change of throughput and stage p95s vs a saved run."""
+    def change(new, old):
+        return f"{100 * (new - old) / old:+.1f}%" if old else "n/a"
+
+    print(f"\nvs baseline: answers/s {baseline['answers_per_s']} -> {result['answers_per_s']} "
+          f"({change(result['answers_per_s'], baseline['answers_per_s'])})")
+    for section in ("stages_ms", "client_ms"):
+        for name, stats in result[section].items():
+            old = (baseline.get(section) or {}).get(name)
+            if stats and old:
+                print(f"  {name:<20} p95 {old['p95']:>9} -> {stats['p95']:>9} ms ({change(stats['p95'], old['p95'])})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20, help="sessions in flight at once")
+    parser.add_argument("--questions", type=int, default=None, help="generate this many questions per session "
+                        "(default: replay the TEST_CASES conversations)")
+    parser.add_argument("--followups", type=int, default=1, help="follow-ups per question")
+    parser.add_argument("--stt-ms-per-second", type=float, default=50)
+    parser.add_argument("--webhook-ms", type=float, default=150)
+    parser.add_argument("--tts-first-ms", type=float, default=120)
+    parser.add_argument("--real", default="", help="comma list of real backends to use: stt,tts")
+    parser.add_argument("--webhook-url", default=None, help="send webhook calls here instead of the in-memory stub")
+    parser.add_argument("--decision-backend", default="webhook", choices=BACKENDS)
+    parser.add_argument("--output", help="write the JSON result to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --output")
+    args = parser.parse_args()
+    # run() changes into the repo root
+    args.output = args.output and os.path.abspath(args.output)
+    args.compare = args.compare and os.path.abspath(args.compare)
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""GET /transcript cost on long transcripts: the old O(n^2) renumbering pass
+versus the append-only slice, ?since= polling and ETag revalidation.
+
+    python benchmarks/transcript_endpoint.py --entries 10000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from interview_logic.sessions.session_store import new_session_state
+from interview_logic.sessions.transcript import append_entry
+
+
+def legacy_enhance(transcript):
+    # The numbering loop GET /transcript used to run on every call
+    enhanced = []
+    for i, entry in enumerate(transcript):
+        enhanced_entry = entry.copy()
+        if entry.get("speaker") == "AI" and not entry.get("is_followup") and not entry.get("transition_to"):
+            question_idx = 0
+            for j in range(i):
+                if transcript[j].get("speaker") == "AI" and not transcript[j].get("is_followup") and not transcript[j].get("transition_to"):
+                    question_idx += 1
+            enhanced_entry["question_number"] = question_idx + 1
+        enhanced.append(enhanced_entry)
+    return enhanced
+
+
+def build_state(entries):
+    state = new_session_state("custom")
+    i = 0
+    while len(state["transcript"]) < entries:
+        append_entry(state, {"speaker": "AI", "text": f"Question {i}?"})
+        append_entry(state, {"speaker": "Human", "text": "An answer of a typical length " * 5})
+        append_entry(state, {"speaker": "AI", "text": "Could you expand on that?", "is_followup": True})
+        append_entry(state, {"speaker": "Human", "text": "A follow-up answer.", "is_followup_answer": True})
+        append_entry(state, {"speaker": "AI", "text": "Thanks.", "transition_to": i + 2})
+        i += 1
+    return state
+
+
+async def timed(client, label, runs, **kwargs):
+    started = time.perf_counter()
+    for _ in range(runs):
+        r = await client.get("/transcript", **kwargs)
+    ms = (time.perf_counter() - started) * 1000 / runs
+    print(f"{label:<34}{ms:>10.2f} ms  status={r.status_code} bytes={len(r.content)}")
+    return r
+
+
+async def main_async(args):
+    os.chdir(REPO_ROOT)  # api.py mounts app/static relative to the cwd
+    import api
+    state = build_state(args.entries)
+    session_id = api.sessions.create("custom")
+    api.sessions.save(session_id, state)
+
+    started = time.perf_counter()
+    legacy_enhance(state["transcript"])
+    print(f"{'legacy renumbering (function only)':<34}{(time.perf_counter() - started) * 1000:>10.2f} ms")
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        params = {"session_id": session_id}
+        r = await timed(client, "full fetch", args.runs, params=params)
+        offset = r.json()["next_offset"]
+        etag = r.headers["etag"]
+        await timed(client, "poll ?since=next_offset", args.runs, params={**params, "since": offset})
+        await timed(client, "revalidate (If-None-Match -> 304)", args.runs, params=params, headers={"If-None-Match": etag})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
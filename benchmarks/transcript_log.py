@@ -0,0 +1,141 @@
+"""Transcript log append throughput and in-memory cost of transcript entries.
+
+1. Append throughput: --sessions concurrent sessions each save --turns turns
+   (question, answer, reply + meta) through InMemorySessionStore with a
+   TranscriptLog, for a few flush/fsync settings, against a naive
+   write+fsync per record.
+2. Memory per 1k turns: tracemalloc of a 1k-turn transcript held as dicts vs
+   TranscriptEntry objects (texts are shared, so this is container overhead).
+3. Export: peak memory of streaming one long interview from the log with
+   iter_entries() vs replaying it into memory.
+
+    python benchmarks/transcript_log.py --sessions 50 --turns 40
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from call_n8n_tester import TEST_CASES
+from interview_logic.sessions.session_store import InMemorySessionStore
+from interview_logic.sessions.transcript import TranscriptEntry, append_entry
+from interview_logic.sessions.transcript_log import TranscriptLog
+
+TEXTS = [entry["text"] for case in TEST_CASES.values() for entry in case["transcript"]]
+
+
+def turn_entries(turn):
+    return [
+        {"speaker": "AI", "text": TEXTS[turn % len(TEXTS)]},
+        {"speaker": "Human", "text": TEXTS[(turn + 1) % len(TEXTS)]},
+        {"speaker": "AI", "text": TEXTS[(turn + 2) % len(TEXTS)], "is_followup": True},
+    ]
+
+
+def run_store(path, sessions, turns, flush_interval, fsync):
+    store = InMemorySessionStore(max_sessions=sessions * 2, transcript_log=TranscriptLog(path, flush_interval, fsync))
+    ids = [store.create("custom") for _ in range(sessions)]
+    started = time.perf_counter()
+    # Interleave sessions the way concurrent interviews hit the server
+    for turn in range(turns):
+        for session_id in ids:
+            state = store.get(session_id)
+            for entry in turn_entries(turn):
+                append_entry(state, entry)
+            state["index"] = turn
+            store.save(session_id, state)
+    submitted = time.perf_counter() - started
+    store.transcript_log.flush()
+    durable = time.perf_counter() - started
+    stats = dict(store.transcript_log.stats)
+    store.transcript_log.close()
+    return submitted, durable, stats
+
+
+def run_naive(path, sessions, turns):
+    started = time.perf_counter()
+    records = 0
+    with open(path, "a", encoding="utf-8") as f:
+        for turn in range(turns):
+            for session_id in range(sessions):
+                for entry in turn_entries(turn):
+                    f.write(json.dumps({"sid": session_id, "op": "append", "entry": entry}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                    records += 1
+    return time.perf_counter() - started, records
+
+
+def allocated(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    value = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return value, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--export-turns", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Append: {args.sessions} sessions x {args.turns} turns, 3 entries + meta per turn")
+        print(f"{'mode':<26}{'records/s':>11}{'batches':>9}{'fsyncs':>8}{'submit s':>10}{'durable s':>11}")
+        for label, flush_interval, fsync in (("batched, 50ms, fsync", 0.05, True),
+                                             ("batched, no wait, fsync", 0.0, True),
+                                             ("batched, no fsync", 0.05, False)):
+            path = os.path.join(tmp, f"{label}.jsonl".replace(" ", "_").replace(",", ""))
+            submitted, durable, stats = run_store(path, args.sessions, args.turns, flush_interval, fsync)
+            print(f"{label:<26}{stats['records'] / durable:>11.0f}{stats['batches']:>9}{stats['fsyncs']:>8}"
+                  f"{submitted:>10.3f}{durable:>11.3f}")
+        naive_turns = max(1, args.turns // 10)  # one fsync per record is slow; scale down
+        elapsed, records = run_naive(os.path.join(tmp, "naive.jsonl"), args.sessions, naive_turns)
+        print(f"{'naive fsync per record':<26}{records / elapsed:>11.0f}{'-':>9}{records:>8}{'-':>10}{elapsed:>11.3f}")
+
+        entries = [entry for turn in range(1000) for entry in turn_entries(turn)]
+        _, as_dicts = allocated(lambda: [dict(entry) for entry in entries])
+        _, as_slots = allocated(lambda: [TranscriptEntry.from_dict(entry) for entry in entries])
+        print(f"\nMemory per 1k turns ({len(entries)} entries, texts shared): "
+              f"dicts {as_dicts / 1024:.0f} KiB, TranscriptEntry {as_slots / 1024:.0f} KiB "
+              f"({100 * (1 - as_slots / as_dicts):.0f}% less)")
+
+        path = os.path.join(tmp, "export.jsonl")
+        store = InMemorySessionStore(transcript_log=TranscriptLog(path, 0.0, False))
+        session_id = store.create("custom")
+        state = store.get(session_id)
+        for turn in range(args.export_turns):
+            for entry in turn_entries(turn):
+                append_entry(state, entry)
+        state["is_interview_complete"] = True
+        store.save(session_id, state)
+        transcript_log = store.transcript_log
+        transcript_log.flush()
+
+        def streamed():
+            return sum(len(json.dumps(entry)) for entry in transcript_log.iter_entries(session_id))
+
+        for label, export in (("iter_entries (streamed)", streamed),
+                              ("replay into memory", lambda: len(json.dumps(transcript_log.replay()[session_id][1]["transcript"],
+                                                                           default=lambda e: e.to_dict())))):
+            tracemalloc.start()
+            started = time.perf_counter()
+            export()
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"Export {args.export_turns} turns, {label:<24} peak {peak / 1024 / 1024:7.2f} MiB  {elapsed:.2f}s")
+        transcript_log.close()
+
+
+if __name__ == "__main__":
+    main()
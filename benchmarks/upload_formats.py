@@ -0,0 +1,112 @@
+"""Upload bytes and server decode cost per answer for each upload format.
+
+  webm-probed   what older clients sent: MediaRecorder webm/opus (48 kHz,
+                128 kbit/s) labelled audio/wav, so ffmpeg probes the format
+                and resamples
+  webm-opus     the same recording at --opus-bitrate with its real type
+                declared (UPLOAD_AUDIO_FORMAT=opus): ffmpeg, no probing
+  wav-48k       uncompressed 48 kHz PCM: ffmpeg still has to resample
+  wav-16k       16 kHz mono PCM as the client sends after downsampling
+                (UPLOAD_AUDIO_FORMAT=pcm16): read by numpy, no ffmpeg at all
+
+Every answer goes through decode_upload() exactly as /answer calls it.
+CPU is this process plus the ffmpeg children, per answer. Formats that
+need ffmpeg are skipped when it is not on PATH.
+
+    python benchmarks/upload_formats.py --seconds 20 --runs 20
+"""
+import argparse
+import io
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from interview_logic.utils.audio_io import SAMPLE_RATE, decode_upload
+
+RECORDER_RATE = 48000
+
+
+def synthetic_speech(seconds, samplerate, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    voiced = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 5))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    noise = rng.normal(0, 0.01, len(t))
+    return (np.clip(0.2 * voiced * syllables + noise, -1, 1) * 32767).astype(np.int16)
+
+
+def wav_bytes(samples, samplerate):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(samplerate)
+        wav.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+def webm_opus(samples, samplerate, bitrate):
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-f", "s16le", "-ar", str(samplerate), "-ac", "1",
+           "-i", "pipe:0", "-c:a", "libopus", "-b:a", str(bitrate), "-f", "webm", "pipe:1"]
+    return subprocess.run(cmd, input=samples.tobytes(), capture_output=True, check=True).stdout
+
+
+def cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def measure(data, content_type, runs):
+    decode_upload(data, content_type)  # warm-up
+    wall, cpu = [], []
+    for _ in range(runs):
+        cpu_started, started = cpu_seconds(), time.perf_counter()
+        audio = decode_upload(data, content_type)
+        wall.append((time.perf_counter() - started) * 1000)
+        cpu.append((cpu_seconds() - cpu_started) * 1000)
+    return audio, statistics.median(wall), statistics.median(cpu)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=20.0, help="length of the answer")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--opus-bitrate", type=int, default=32000)
+    args = parser.parse_args()
+
+    recorded = synthetic_speech(args.seconds, RECORDER_RATE)
+    # What the browser's OfflineAudioContext hands back: the same take at 16 kHz
+    downsampled = synthetic_speech(args.seconds, SAMPLE_RATE)
+    have_ffmpeg = shutil.which("ffmpeg") is not None
+
+    formats = [
+        ("webm-probed", lambda: webm_opus(recorded, RECORDER_RATE, 128000), "audio/wav", True),
+        ("webm-opus", lambda: webm_opus(recorded, RECORDER_RATE, args.opus_bitrate), "audio/webm;codecs=opus", True),
+        ("wav-48k", lambda: wav_bytes(recorded, RECORDER_RATE), "audio/wav", True),
+        ("wav-16k", lambda: wav_bytes(downsampled, SAMPLE_RATE), "audio/wav", False),
+    ]
+
+    print(f"{args.seconds:.0f}s answer, median of {args.runs} runs")
+    print(f"{'format':<13}{'upload KB':>11}{'KB/s':>8}{'decode ms':>11}{'CPU ms':>9}{'samples':>10}")
+    for name, build, content_type, needs_ffmpeg in formats:
+        if needs_ffmpeg and not have_ffmpeg:
+            print(f"{name:<13}  skipped (ffmpeg not found)")
+            continue
+        data = build()
+        audio, wall_ms, cpu_ms = measure(data, content_type, args.runs)
+        kb = len(data) / 1024
+        print(f"{name:<13}{kb:>11.1f}{kb / args.seconds:>8.1f}{wall_ms:>11.2f}{cpu_ms:>9.2f}{len(audio):>10}")
+
+
+if __name__ == "__main__":
+    main()
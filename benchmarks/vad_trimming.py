@@ -0,0 +1,97 @@
+"""How much audio the VAD keeps away from Whisper on a synthetic corpus.
+
+Each clip is background noise with leading/trailing silence and pauses
+around "speech" (harmonic tones with a syllable-rate envelope plus
+fricative-like noise bursts); a share of the clips are silence only.
+Reports seconds in vs seconds sent to the model, Whisper windows saved,
+how much of the true speech was kept, and VAD cost per clip.
+
+    python benchmarks/vad_trimming.py --clips 200
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from interview_logic.utils.vad import speech_chunks, speech_mask, SAMPLE_RATE
+
+
+def synthetic_speech(rng, seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = rng.uniform(100, 220)
+    voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 5))
+    syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t), 0, None)
+    fricatives = rng.normal(0, 1, len(t)) * (np.sin(2 * np.pi * 1.3 * t) > 0.9)
+    return (0.2 * voiced * syllables + 0.05 * fricatives).astype(np.float32)
+
+
+def synthetic_clip(rng, silent):
+    noise_level = rng.choice([0.001, 0.004, 0.01])
+    parts, truth = [], []
+
+    def add(audio, is_speech):
+        parts.append(audio)
+        truth.append(np.full(len(audio), is_speech))
+
+    def noise(seconds):
+        return rng.normal(0, noise_level, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+    add(noise(rng.uniform(1, 5)), False)
+    if not silent:
+        for _ in range(rng.integers(1, 4)):
+            add(synthetic_speech(rng, rng.uniform(2, 12)), True)
+            add(noise(rng.uniform(0.5, 3)), False)
+    add(noise(rng.uniform(2, 4)), False)  # browser stops after ~3s of silence
+    audio = np.concatenate(parts)
+    return audio + rng.normal(0, noise_level, len(audio)).astype(np.float32), np.concatenate(truth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clips", type=int, default=200)
+    parser.add_argument("--silent-share", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    seconds_in = seconds_out = windows_in = windows_out = 0.0
+    speech_total = speech_kept = 0
+    skipped = silent_clips = 0
+    vad_ms = []
+
+    for _ in range(args.clips):
+        silent = rng.random() < args.silent_share
+        silent_clips += silent
+        audio, truth = synthetic_clip(rng, silent)
+
+        started = time.perf_counter()
+        chunks = speech_chunks(audio)
+        vad_ms.append((time.perf_counter() - started) * 1000)
+        mask, frame_len = speech_mask(audio)
+
+        kept = np.repeat(mask, frame_len)
+        kept = np.pad(kept, (0, len(audio) - len(kept)))
+        speech_total += truth.sum()
+        speech_kept += (truth & kept).sum()
+
+        seconds_in += len(audio) / SAMPLE_RATE
+        seconds_out += sum(len(c) for c in chunks) / SAMPLE_RATE
+        windows_in += math.ceil(len(audio) / SAMPLE_RATE / 30)
+        windows_out += len(chunks)
+        skipped += not chunks
+
+    print(f"Clips: {args.clips} ({silent_clips} silence-only, {skipped} skipped entirely)")
+    print(f"Audio seconds: {seconds_in:.0f} in -> {seconds_out:.0f} sent to Whisper "
+          f"({100 * (1 - seconds_out / seconds_in):.0f}% less)")
+    print(f"Whisper 30s windows: {windows_in:.0f} -> {windows_out:.0f}")
+    print(f"True speech kept: {100 * speech_kept / max(1, speech_total):.1f}%")
+    print(f"VAD cost per clip: median {np.median(vad_ms):.2f}ms, max {max(vad_ms):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Local stand-in for the n8n webhook with injectable latency and errors,
+plus a driver that exercises WebhookClient against it.
+
+    # run the stub and fire 500 calls through WebhookClient (default)
+    python benchmarks/webhook_stub.py --calls 500 --error-rate 0.1 --slow-rate 0.05
+
+    # only serve the stub, e.g. for WEBHOOK_URL=http://127.0.0.1:8765/webhook uvicorn api:app
+    python benchmarks/webhook_stub.py --serve
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from interview_logic.LLM.webhook_client import WebhookClient, CircuitBreaker
+
+stub = FastAPI()
+settings = {"latency_ms": 150, "slow_rate": 0.0, "slow_ms": 3000, "error_rate": 0.0, "calls": 0}
+
+
+@stub.post("/webhook")
+async def fake_decision(request: Request):
+    payload = await request.json()
+    settings["calls"] += 1
+    delay = settings["slow_ms"] if random.random() < settings["slow_rate"] else random.gauss(settings["latency_ms"], settings["latency_ms"] / 4)
+    await asyncio.sleep(max(0.0, delay) / 1000)
+    if random.random() < settings["error_rate"]:
+        return JSONResponse(status_code=500, content={"message": "Injected failure"})
+
+    # Same contract as the n8n workflow: the decision is a JSON string in "output"
+    follow_up = len(payload.get("transcript", [])) % 3 == 2
+    output = {
+        "is_follow_up": follow_up,
+        "response": "Can you give a concrete example?" if follow_up else "Thanks. Next question.",
+    }
+    return {"output": json.dumps(output)}
+
+
+async def drive(args, url):
+    client = WebhookClient(
+        url,
+        timeout=args.timeout,
+        retries=args.retries,
+        breaker=CircuitBreaker(failure_threshold=5, reset_timeout=2.0),
+    )
+    payload = {"questions": ["Q1"], "current_question": 1, "transcript": [{"speaker": "AI", "text": "Q1"}]}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            data = await client.post(payload)
+            latencies.append((time.perf_counter() - started) * 1000)
+            return data.get("fallback", False)
+
+    started = time.perf_counter()
+    fallbacks = await asyncio.gather(*[one() for _ in range(args.calls)])
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+
+    latencies.sort()
+    print(f"Calls: {args.calls} in {elapsed:.2f}s  stub hits: {settings['calls']}")
+    print(f"Client stats: {client.stats}  circuit: {client.breaker.state}")
+    print(f"Fallback responses: {sum(fallbacks)}")
+    print(f"Latency p50={latencies[len(latencies) // 2]:.0f}ms "
+          f"p95={latencies[int(len(latencies) * 0.95) - 1]:.0f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1]:.0f}ms max={latencies[-1]:.0f}ms")
+
+
+async def main_async(args):
+    config = uvicorn.Config(stub, host="127.0.0.1", port=args.port, log_level="warning")
+    server = uvicorn.Server(config)
+    if args.serve:
+        await server.serve()
+        return
+
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        await drive(args, f"http://127.0.0.1:{args.port}/webhook")
+    finally:
+        server.should_exit = True
+        await serve_task
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serve", action="store_true", help="Only run the stub server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Fraction of calls delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=3000)
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of calls answered with HTTP 500")
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--retries", type=int, default=2)
+    args = parser.parse_args()
+    settings.update(latency_ms=args.latency_ms, slow_rate=args.slow_rate, slow_ms=args.slow_ms, error_rate=args.error_rate)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Startup time, resident memory and per-clip latency of each Whisper variant.
+
+Every variant is measured in a fresh child process so import/load time and
+RSS are not polluted by the previous model. Clips are synthetic speech-like
+audio (see vad_trimming.py) of a few lengths; pass --audio to add real files.
+Results are printed as JSON, one object per variant.
+
+    python benchmarks/whisper_variants.py --variants base,base-int8,tiny,tiny-int8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    return None
+
+
+def measure(variant, clip_seconds, repeats, audio_paths):
+    """Runs inside the child process."""
+    import numpy as np
+    from benchmarks.vad_trimming import synthetic_speech
+    from interview_logic.STT.model_manager import VARIANTS
+
+    result = {"variant": variant, "rss_before_mb": rss_mb()}
+    started = time.perf_counter()
+    from interview_logic.STT.whisper_stt import WhisperSTT
+    result["import_seconds"] = round(time.perf_counter() - started, 2)
+
+    model_name, quantize = VARIANTS[variant]
+    started = time.perf_counter()
+    stt = WhisperSTT(model_name, quantize=quantize)
+    result["load_seconds"] = round(time.perf_counter() - started, 2)
+    result["rss_loaded_mb"] = rss_mb()
+
+    started = time.perf_counter()
+    stt.model.transcribe(np.zeros(16000 * 2, np.float32))
+    result["first_inference_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    rng = np.random.default_rng(0)
+    clips = [(f"synthetic_{s}s", synthetic_speech(rng, s)) for s in clip_seconds]
+    clips += [(os.path.basename(path), path) for path in audio_paths]
+    result["clips"] = {}
+    for name, audio in clips:
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            stt.transcribe(audio)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        result["clips"][name] = {"median_ms": round(timings[len(timings) // 2], 1), "max_ms": round(timings[-1], 1)}
+    result["rss_peak_mb"] = rss_mb()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", default="base,base-int8,tiny,tiny-int8")
+    parser.add_argument("--clip-seconds", default="3,10,25")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--audio", nargs="*", default=[], help="extra audio files to transcribe")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    clip_seconds = [float(s) for s in args.clip_seconds.split(",")]
+
+    if args.child:
+        print(json.dumps(measure(args.child, clip_seconds, args.repeats, args.audio)))
+        return
+
+    for variant in args.variants.split(","):
+        command = [sys.executable, __file__, "--child", variant, "--clip-seconds", args.clip_seconds,
+                   "--repeats", str(args.repeats), "--audio", *args.audio]
+        started = time.perf_counter()
+        proc = subprocess.run(command, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(json.dumps({"variant": variant, "error": proc.stderr.strip().splitlines()[-1:]}))
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result["process_seconds"] = round(time.perf_counter() - started, 2)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,9 @@
 
 
 import requests
+from interview_logic.config import WEBHOOK_URL
 
 def main():
-    # TODO: replace this with your actual n8n Webhook URL
-    WEBHOOK_URL = "https://hudmarr.app.n8n.cloud/webhook/fb613c07-aa88-4fbd-a3c9-ba4cdf7387a9"
 
     # 1) Prompt the user for input
     user_input = input("Enter your message to n8n: ")
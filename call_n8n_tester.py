@@ -1,7 +1,7 @@
 import requests
 
-# TODO: replace this with your actual n8n Webhook URL
-WEBHOOK_URL = "https://hudmarr.app.n8n.cloud/webhook/fb613c07-aa88-4fbd-a3c9-ba4cdf7387a9"
+# Set WEBHOOK_URL in the environment to point at a different n8n webhook
+from interview_logic.config import WEBHOOK_URL
 
 # Select which test scenario to run (change this value to "1", "2", "3", "4", or "5")
 TEST_ID = "2"
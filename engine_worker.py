@@ -0,0 +1,54 @@
+# Speech engines (Whisper + TTS) in their own process, for API workers started
+# with ENGINE_MODE=remote:
+#
+#   export ENGINE_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(32))")
+#   python engine_worker.py --address 127.0.0.1:6100
+#   ENGINE_MODE=remote SESSION_BACKEND=sqlite uvicorn api:app --workers 4
+#
+# The API processes then start without importing torch, and all of them share
+# this process's models and TTS cache. Model variants, warm-up and the TTS
+# cache are configured by the same environment variables as in-process mode.
+# ENGINE_AUTHKEY has no default and both sides refuse to start without it:
+# messages are pickles, so the key is what stops other local users from
+# running code in these processes. A Unix socket path is created mode 0600.
+#
+# With more than one API worker, sessions must live in SQLite: the default
+# memory store is per process, so a session created by one worker is unknown
+# to the next, and each worker's transcript log would record a different
+# subset of turns.
+
+import argparse
+
+from interview_logic import config
+from interview_logic.STT.model_manager import ModelManager
+from interview_logic.TTS.edge_tts_engine import EdgeTTS
+from interview_logic.TTS.tts_cache import TTSCache
+from interview_logic.utils.engine_link import EngineServer
+from interview_logic.utils.logs import setup_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Whisper and TTS to API workers over a local socket.")
+    parser.add_argument("--address", default=config.ENGINE_ADDRESS, help='"host:port" or a Unix socket path')
+    args = parser.parse_args()
+    if not config.ENGINE_AUTHKEY:
+        parser.error("ENGINE_AUTHKEY is not set; use the same secret for the API workers")
+
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATE)
+    models = ModelManager(
+        variants=config.STT_MODEL_VARIANTS,
+        default=config.STT_DEFAULT_VARIANT,
+        warmup=config.STT_WARMUP,
+    )
+    # Accept connections while loading; clients see the progress in status
+    models.start()
+    tts = EdgeTTS(cache=TTSCache(
+        max_bytes=config.TTS_CACHE_MAX_BYTES,
+        disk_dir=config.TTS_CACHE_DIR,
+        disk_max_bytes=config.TTS_CACHE_DISK_MAX_BYTES,
+    ))
+    EngineServer(models, tts).serve_forever(args.address, config.ENGINE_AUTHKEY)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import json
+import time
+
+from interview_logic.utils.latency import LatencyRecorder
+
+BACKENDS = ("webhook", "local", "webhook+local")
+
+
+class DecisionBackend:
+    """Decides, after each answer, whether to ask a follow-up or move on.
+
+    post(payload) takes the payload PayloadBuilder builds and returns what
+    the n8n webhook returns: {"output": '{"is_follow_up": bool, "response": str}'},
+    plus "fallback": True when the answer is a stand-in rather than a real
+    decision (those are never cached or marked as sent). WebhookClient is
+    the remote implementation; LocalDecisionBackend runs in process.
+    """
+
+    name = "base"
+
+    async def post(self, payload: dict) -> dict:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+    @staticmethod
+    def output(is_follow_up, response, **extra):
+        return {"output": json.dumps({"is_follow_up": is_follow_up, "response": response}), **extra}
+
+
+class FallbackDecisionBackend(DecisionBackend):
+    """Uses `primary` and asks `secondary` whenever primary gives up (its
+    response carries "fallback"), e.g. the local engine during an n8n outage."""
+
+    name = "fallback"
+
+    def __init__(self, primary, secondary):
+        self.primary = primary
+        self.secondary = secondary
+        self.stats = {"requests": 0, "secondary_used": 0}
+
+    async def post(self, payload):
+        self.stats["requests"] += 1
+        data = await self.primary.post(payload)
+        if not data.get("fallback"):
+            return data
+        self.stats["secondary_used"] += 1
+        data = await self.secondary.post(payload)
+        # Still a stand-in decision: keep it out of the cache and the sent marker
+        return {**data, "fallback": True}
+
+    async def aclose(self):
+        await self.primary.aclose()
+        await self.secondary.aclose()
+
+
+class LocalDecisionBackend(DecisionBackend):
+    """In-process decision engine, no network round trip.
+
+    Wraps a decider (see local_decider.RuleBasedDecider) exposing
+    decide(payload) -> (is_follow_up, response) and records its latency.
+    """
+
+    name = "local"
+
+    def __init__(self, decider):
+        self.decider = decider
+        self.latency = LatencyRecorder(window=500)
+        self.stats = {"requests": 0, "follow_ups": 0}
+
+    async def post(self, payload):
+        started = time.perf_counter()
+        is_follow_up, response = self.decider.decide(payload)
+        self.latency.record((time.perf_counter() - started) * 1000)
+        self.stats["requests"] += 1
+        self.stats["follow_ups"] += is_follow_up
+        return self.output(is_follow_up, response, backend=self.name)
+
+
+def create_decision_backend(name, webhook=None, decider=None):
+    """"webhook" (n8n only), "local" (in-process only) or "webhook+local"
+    (n8n, with the local engine answering whenever the webhook fails)."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown decision backend: {name} (choose from {', '.join(BACKENDS)})")
+    if name == "webhook":
+        return webhook
+    if decider is None:
+        from interview_logic.LLM.local_decider import RuleBasedDecider
+        decider = RuleBasedDecider()
+    local = LocalDecisionBackend(decider)
+    if name == "local":
+        return local
+    return FallbackDecisionBackend(webhook, local)
@@ -0,0 +1,104 @@
+import re
+import zlib
+
+STOPWORDS = {
+    "about", "actually", "after", "again", "also", "because", "before", "being", "between", "could",
+    "different", "during", "every", "first", "really", "should", "something", "their", "there",
+    "these", "thing", "things", "think", "those", "through", "which", "while", "would", "working",
+}
+WORD = re.compile(r"[A-Za-z][A-Za-z+#.-]*[A-Za-z+#]")
+# Signals that an answer is anchored in something concrete, or says what came of it
+EXAMPLE_MARKERS = re.compile(r"\b(for example|for instance|such as|specifically|in one case|at my|last year|\d+)", re.I)
+OUTCOME_MARKERS = re.compile(r"(result|improv|reduc|increas|sav(ed|ing)|faster|led to|impact|learn|%|outcome|deliver)", re.I)
+
+UNCLEAR = [
+    "Sorry, I didn't quite catch that. Could you tell me a bit more?",
+    "Could you say a little more about that?",
+]
+ELABORATE = [
+    "Could you expand on that a little? I'd like to hear more about {topic}.",
+    "Can you go into a bit more detail on {topic}?",
+]
+EXAMPLE = [
+    "Can you give me a concrete example involving {topic}?",
+    "Could you walk me through a specific situation where {topic} came up?",
+]
+OUTCOME = [
+    "What was the outcome, and how did you measure it?",
+    "What impact did that have, and what did you learn from it?",
+]
+TRANSITION = [
+    "Thank you for sharing that. Let's move on to the next question.",
+    "That's helpful, thanks. Let's continue with the next question.",
+    "Great, thank you. On to the next one.",
+]
+CLOSING = "Thank you, that was the last question. It was great talking with you."
+
+
+class RuleBasedDecider:
+    """Deterministic follow-up / next-question rules, microseconds per call.
+
+    Asks at most `max_followups` follow-ups per question: when the answer is
+    unclear or shorter than `min_words`, when it gives no concrete example,
+    or when it never says what came of it. Follow-ups name a salient term
+    from the answer; phrasing is picked by hashing the answer so replays are
+    stable. Otherwise it moves on, with a closing line after the last question.
+    """
+
+    def __init__(self, min_words=20, max_followups=1):
+        self.min_words = min_words
+        self.max_followups = max_followups
+
+    def decide(self, payload):
+        transcript = payload.get("transcript", [])
+        answer = next((e for e in reversed(transcript) if e.get("speaker") == "Human"), {})
+        text = answer.get("text", "").strip()
+        seed = zlib.crc32(text.encode("utf-8"))
+
+        if self._followups_asked(transcript) < self.max_followups:
+            followup = self._followup(text)
+            if followup is not None:
+                templates, topic = followup
+                return True, templates[seed % len(templates)].format(topic=topic)
+
+        total = payload.get("total_questions") or len(payload.get("questions", []))
+        if total and payload.get("current_question", 0) >= total:
+            return False, CLOSING
+        return False, TRANSITION[seed % len(TRANSITION)]
+
+    def _followups_asked(self, transcript):
+        # Follow-ups since the current question was asked; in "delta" payloads
+        # only the newest entries are present, but the answer flag still is
+        count = 0
+        for entry in reversed(transcript):
+            if entry.get("speaker") == "AI":
+                if not entry.get("is_followup"):
+                    break
+                count += 1
+        if count == 0 and transcript and transcript[-1].get("is_followup_answer"):
+            count = 1
+        return count
+
+    def _followup(self, text):
+        words = text.split()
+        if len(words) < 3:
+            return UNCLEAR, None
+        topic = self._topic(text)
+        if len(words) < self.min_words:
+            return ELABORATE, topic
+        if not EXAMPLE_MARKERS.search(text):
+            return EXAMPLE, topic
+        if not OUTCOME_MARKERS.search(text):
+            return OUTCOME, topic
+        return None
+
+    @staticmethod
+    def _topic(text):
+        # A proper noun mid-sentence (a tool, a company) is usually the most
+        # specific thing said; otherwise the longest uncommon word
+        for sentence in re.split(r"(?<=[.!?])\s+", text):
+            for word in WORD.findall(sentence)[1:]:
+                if word[0].isupper() and word != "I":
+                    return word
+        candidates = [w for w in WORD.findall(text) if len(w) > 5 and w.lower() not in STOPWORDS]
+        return f"the {max(candidates, key=len).lower()}" if candidates else "that"
@@ -0,0 +1,148 @@
+import json
+
+from interview_logic.sessions.transcript import entry_dict
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+except Exception:  # tiktoken missing, or its BPE file can't be fetched offline
+    def count_tokens(text: str) -> int:
+        return max(1, len(text) // 4)
+
+
+class PayloadBuilder:
+    """Builds the webhook payload for one turn without resending the whole
+    interview every time.
+
+    Modes:
+      "full"   - the original payload: every transcript entry on every turn.
+      "budget" - the most recent entries, with older entries folded into a
+                 short rolling "summary", so that the whole payload (question
+                 list, summary and entries) fits in `token_budget` tokens. When
+                 the question list alone would take more than half the budget,
+                 only the current question text and the total are sent.
+      "delta"  - only the entries added since the last successful webhook
+                 call (still capped by the budget), plus the summary. The
+                 question list is sent on the first call only (if it fits,
+                 as above); later calls carry just the current question
+                 text and the total.
+
+    "transcript_offset" tells the workflow where the sent entries start in
+    the full transcript. The summary is built incrementally and kept on the
+    session state, so each entry is summarized once; that state belongs to
+    one transcript_generation and starts over when the interview restarts.
+    The last two entries are always sent, even over the budget.
+    """
+
+    STATE_KEYS = ("webhook_sent_upto", "summarized_upto", "summary_lines", "summary_dropped")
+
+    def __init__(self, mode="budget", token_budget=1500, summary_words=20, max_summary_lines=40):
+        if mode not in ("full", "budget", "delta"):
+            raise ValueError(f"Unknown payload mode: {mode}")
+        self.mode = mode
+        self.token_budget = token_budget
+        self.summary_words = summary_words
+        self.max_summary_lines = max_summary_lines
+
+    def build(self, state, current_index) -> dict:
+        transcript = state["transcript"]
+        payload = {
+            "questions": [q["question"] for q in state["questions"]],
+            "current_question": current_index + 1,  # 1-based index for the LLM
+        }
+        if self.mode == "full":
+            payload["transcript"] = [entry_dict(entry) for entry in transcript]
+            return payload
+
+        self._sync_generation(state)
+        sent_upto = state.get("webhook_sent_upto", 0) if self.mode == "delta" else 0
+        if sent_upto or self._cost(payload) > self.token_budget // 2:
+            questions = payload.pop("questions")
+            payload["current_question_text"] = questions[current_index]
+            payload["total_questions"] = len(questions)
+
+        # What is left after the questions goes to the newest entries first;
+        # a third is held back for the summary of the older ones
+        remaining = self.token_budget - self._cost({**payload, "summary": "", "transcript_offset": 0, "transcript": []})
+        entries = [entry_dict(entry) for entry in transcript]
+        keep_from = max(self._budget_start(entries, remaining - remaining // 3), sent_upto)
+        self._extend_summary(state, keep_from)
+
+        payload["transcript"] = entries[keep_from:]
+        payload["transcript_offset"] = keep_from
+        summary_budget = remaining - sum(self._cost(entry) for entry in payload["transcript"])
+        payload["summary"] = self._summary_text(state, summary_budget)
+        # Token counts of the parts don't add up exactly to the whole
+        while payload["summary"] and self._cost(payload) > self.token_budget:
+            summary_budget -= self._cost(payload) - self.token_budget
+            payload["summary"] = self._summary_text(state, summary_budget)
+        return payload
+
+    def mark_sent(self, state):
+        self._sync_generation(state)
+        state["webhook_sent_upto"] = len(state["transcript"])
+
+    def _sync_generation(self, state):
+        # A restarted interview (reset_transcript) bumps the generation; what
+        # was sent and summarized belongs to the previous run
+        generation = state.get("transcript_generation", 0)
+        if state.get("payload_generation", 0) != generation:
+            for key in self.STATE_KEYS:
+                state.pop(key, None)
+            state["payload_generation"] = generation
+
+    @staticmethod
+    def _cost(value):
+        return count_tokens(json.dumps(value))
+
+    def _budget_start(self, entries, budget):
+        # Walk back from the newest entry; always keep at least the last two
+        # so the current question and answer are never summarized away
+        used = 0
+        start = len(entries)
+        while start > 0:
+            cost = self._cost(entries[start - 1])
+            if used + cost > budget and len(entries) - start >= 2:
+                break
+            used += cost
+            start -= 1
+        return start
+
+    def _extend_summary(self, state, upto):
+        done = state.get("summarized_upto", 0)
+        if upto <= done:
+            return
+        lines = state.setdefault("summary_lines", [])
+        for entry in state["transcript"][done:upto]:
+            if entry.get("transition_to"):
+                continue  # transition lines carry no information about the candidate
+            words = entry["text"].split()
+            text = " ".join(words[:self.summary_words]) + (" ..." if len(words) > self.summary_words else "")
+            if entry.get("speaker") == "Human":
+                lines.append(f"Candidate: {text}")
+            elif entry.get("question_number"):
+                lines.append(f"Q{entry['question_number']}: {text}")
+            else:
+                lines.append(f"Follow-up: {text}")
+        if len(lines) > self.max_summary_lines:
+            state["summary_dropped"] = state.get("summary_dropped", 0) + len(lines) - self.max_summary_lines
+            del lines[:len(lines) - self.max_summary_lines]
+        state["summarized_upto"] = upto
+
+    def _summary_text(self, state, budget):
+        """The newest summary lines that fit in `budget` tokens."""
+        lines = state.get("summary_lines", [])
+        kept = []
+        used = 0
+        for line in reversed(lines):
+            used += self._cost(line)
+            if used > budget:
+                break
+            kept.append(line)
+        kept.reverse()
+        dropped = state.get("summary_dropped", 0) + len(lines) - len(kept)
+        header = [f"({dropped} earlier lines omitted)"] if dropped and kept else []
+        return "\n".join(header + kept)
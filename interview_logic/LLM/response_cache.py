@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Deduplicates identical webhook calls.
+
+    Keyed by sha256 of the canonical JSON payload. Concurrent calls with the
+    same payload share one in-flight request (single flight); completed
+    responses are kept for `ttl_seconds` in a bounded LRU, so a retried or
+    double-submitted turn costs no second LLM call. Fallback responses are
+    never cached, so the next attempt still reaches the webhook.
+    """
+
+    def __init__(self, ttl_seconds=300, max_entries=1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, response)
+        self._inflight = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(payload) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get(self, payload, call):
+        """Cached response for `payload`, or `await call(payload)` exactly once."""
+        key = self.key(payload)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await call(payload)
+            if not response.get("fallback"):
+                self._put(key, response)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # nobody may be waiting; keeps asyncio from warning
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def _put(self, key, response):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
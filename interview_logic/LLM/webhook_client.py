@@ -0,0 +1,181 @@
+import asyncio
+import gzip
+import json
+import logging
+import random
+import time
+
+import httpx
+
+from interview_logic.LLM.decision_backend import DecisionBackend
+from interview_logic.utils.latency import LatencyRecorder
+
+log = logging.getLogger("interview.webhook")
+
+# Used when the webhook is down or the circuit is open: keep the interview
+# moving by going to the next question instead of failing the turn
+FALLBACK_RESPONSE = "Thank you for sharing that. Let's move on to the next question."
+
+
+class WebhookError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; after
+    `reset_timeout` seconds one trial request is let through (half-open)."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+class WebhookClient(DecisionBackend):
+    """Async client for the n8n decision webhook.
+
+    One keep-alive connection pool is shared by all sessions. Each call is
+    retried with jittered exponential backoff; if an attempt runs past the
+    observed p95 latency a second, hedged request is fired and whichever
+    answers first wins. A circuit breaker stops hammering a dead webhook and
+    the caller gets a deterministic "next question" response instead.
+    """
+
+    name = "webhook"
+
+    def __init__(self, url, timeout=10.0, retries=2, backoff=0.25,
+                 hedge_percentile=95, hedge_min_samples=20, breaker=None, max_connections=100,
+                 compress=False):
+        self.url = url
+        self.compress = compress  # gzip request bodies (the receiver must accept Content-Encoding: gzip)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.max_connections = max_connections
+        self.latency = LatencyRecorder(window=500)
+        self.stats = {"requests": 0, "retries": 0, "hedges": 0, "fallbacks": 0}
+        self._client = None
+
+    def _http(self):
+        # Created lazily so the pool belongs to the server's running loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=20),
+            )
+        return self._client
+
+    async def post(self, payload: dict) -> dict:
+        """POST `payload` and return the decoded JSON body.
+
+        Never raises for webhook failures: returns fallback_response() (with
+        "fallback": True) once retries are exhausted or the circuit is open.
+        """
+        self.stats["requests"] += 1
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                log.warning("Circuit %s, using fallback response", self.breaker.state)
+                break
+            try:
+                data = await self._hedged(payload)
+                self.breaker.record_success()
+                return data
+            except WebhookError as e:
+                self.breaker.record_failure()
+                log.warning("Attempt %d failed: %s", attempt + 1, e)
+                if attempt < self.retries:
+                    self.stats["retries"] += 1
+                    # Full jitter keeps retries from many sessions from lining up
+                    await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+        self.stats["fallbacks"] += 1
+        return self.fallback_response()
+
+    @classmethod
+    def fallback_response(cls):
+        return cls.output(False, FALLBACK_RESPONSE, fallback=True)
+
+    async def _hedged(self, payload):
+        first = asyncio.create_task(self._send(payload))
+        hedge_after = None
+        if len(self.latency.samples) >= self.hedge_min_samples:
+            hedge_after = self.latency.percentile(self.hedge_percentile) / 1000
+
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                self.stats["hedges"] += 1
+                tasks.append(asyncio.create_task(self._send(payload)))
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _send(self, payload):
+        started = time.perf_counter()
+        try:
+            if self.compress:
+                body = gzip.compress(json.dumps(payload).encode("utf-8"), compresslevel=5)
+                headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+                response = await self._http().post(self.url, content=body, headers=headers)
+            else:
+                response = await self._http().post(self.url, json=payload)
+        except httpx.HTTPError as e:
+            raise WebhookError(f"{type(e).__name__}: {e}")
+        if response.status_code >= 400:
+            raise WebhookError(f"HTTP {response.status_code}: {response.text[:200]}")
+        try:
+            data = response.json()
+        except ValueError:
+            raise WebhookError(f"Non-JSON response: {response.text[:200]}")
+        self.latency.record((time.perf_counter() - started) * 1000)
+        return data
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
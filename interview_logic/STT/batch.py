@@ -0,0 +1,197 @@
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from interview_logic.sessions.transcript import append_entry, json_default
+from interview_logic.utils.audio_io import SAMPLE_RATE, stream_pcm16
+from interview_logic.utils.vad import speech_segments
+
+log = logging.getLogger("interview.batch")
+
+RECORDING_EXTENSIONS = (".webm", ".mkv", ".mp4", ".ogg", ".wav", ".mp3", ".m4a")
+
+# One WhisperSTT per worker process, loaded once by init_worker
+_stt = None
+
+
+def segment_turns(blocks, samplerate=SAMPLE_RATE, turn_gap_seconds=2.5, start_sample=0):
+    """Group the speech in a stream of int16 blocks into turns.
+
+    Speech separated by at least `turn_gap_seconds` of non-speech starts a
+    new turn (the live client ends an answer after ~3s of silence). Only the
+    audio after the last finished speech segment is carried between blocks,
+    so memory stays bounded however long the recording is. Yields
+    (start_sample, end_sample, float32 audio of the speech only); sample
+    positions are absolute, counted from `start_sample`.
+    """
+    gap = int(turn_gap_seconds * samplerate)
+    buffer = np.zeros(0, np.int16)
+    buffer_start = start_sample
+    parts, turn_start, turn_end = [], None, None
+
+    for block in _with_end_marker(blocks):
+        final = block is None
+        if not final:
+            buffer = np.concatenate((buffer, block))
+        segments = speech_segments(buffer.astype(np.float32) / 32768.0, samplerate) if len(buffer) else []
+
+        cut = len(buffer)
+        for start, end in segments:
+            # A segment running into the end of the buffer may continue in the next block
+            if not final and end > len(buffer) - gap:
+                cut = start
+                break
+            if parts and buffer_start + start - turn_end >= gap:
+                yield turn_start, turn_end, _join(parts)
+                parts = []
+            if not parts:
+                turn_start = buffer_start + start
+            parts.append(buffer[start:end])
+            turn_end = buffer_start + end
+
+        buffer, buffer_start = buffer[cut:], buffer_start + cut
+        # Enough silence after the current turn: emit it now so it can be checkpointed
+        if parts and (final or (len(buffer) == 0 and buffer_start - turn_end >= gap)):
+            yield turn_start, turn_end, _join(parts)
+            parts = []
+
+
+def _with_end_marker(blocks):
+    yield from blocks
+    yield None
+
+
+def _join(parts):
+    return np.concatenate(parts).astype(np.float32) / 32768.0
+
+
+def init_worker(model_name, quantize, threads):
+    global _stt
+    import torch
+    from interview_logic import config
+    from interview_logic.STT.whisper_stt import WhisperSTT
+    from interview_logic.utils.logs import setup_logging
+
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT)
+    torch.set_num_threads(threads)
+    _stt = WhisperSTT(model_name, quantize=quantize)
+
+
+def write_json(path, data):
+    # Write-then-rename so a crash never leaves a half-written file behind
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=json_default)
+    os.replace(tmp, path)
+
+
+def load_questions(path):
+    """Questions from an optional <recording>.questions.json sidecar: a list
+    of strings or {"questions": [{"question": ...}]} as /transcript returns."""
+    sidecar = os.path.splitext(path)[0] + ".questions.json"
+    if not os.path.exists(sidecar):
+        return []
+    with open(sidecar, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("questions", [])
+    return [q if isinstance(q, dict) else {"question": q} for q in data]
+
+
+def process_recording(path, out_path, turn_gap_seconds=2.5, block_seconds=30.0):
+    """Transcribe one recording into `out_path` in the /transcript schema.
+
+    Progress is checkpointed to `out_path`.partial after every turn; a rerun
+    seeks past the turns already done and continues from there. Runs in a
+    worker process set up by init_worker.
+    """
+    checkpoint_path = out_path + ".partial"
+    state = {"questions": load_questions(path), "transcript": [], "questions_asked": 0}
+    offset = 0
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        state["transcript"], offset = checkpoint["transcript"], checkpoint["offset"]
+        log.info("Resuming %s at %.1fs (%d turns done)", path, offset / SAMPLE_RATE, len(state["transcript"]))
+
+    started = time.perf_counter()
+    blocks = stream_pcm16(path, SAMPLE_RATE, block_seconds, start_seconds=offset / SAMPLE_RATE)
+    for start, end, audio in segment_turns(blocks, SAMPLE_RATE, turn_gap_seconds, start_sample=offset):
+        # The previous turn's tail as prompt keeps names and terms consistent
+        previous = state["transcript"][-1]["text"][-200:] if state["transcript"] else None
+        text = _stt.transcribe_audio(audio, initial_prompt=previous)["text"].strip()
+        if text:
+            append_entry(state, {
+                "speaker": "Human",
+                "text": text,
+                "start": round(start / SAMPLE_RATE, 2),
+                "end": round(end / SAMPLE_RATE, 2),
+            })
+        write_json(checkpoint_path, {"source": path, "offset": end, "transcript": state["transcript"]})
+
+    write_json(out_path, {
+        "transcript": state["transcript"],
+        "next_offset": len(state["transcript"]),
+        "questions": state["questions"],
+        "is_complete": True,
+    })
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return {"path": path, "turns": len(state["transcript"]), "seconds": round(time.perf_counter() - started, 1)}
+
+
+def find_recordings(input_dir, output_dir, extensions=RECORDING_EXTENSIONS):
+    """(recording, output json) pairs that still need processing, largest first
+    so the long recordings don't end up as the last jobs on an idle pool."""
+    jobs = []
+    for root, _, files in os.walk(input_dir):
+        for name in files:
+            if not name.lower().endswith(extensions):
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.splitext(os.path.relpath(path, input_dir))[0]
+            out_path = os.path.join(output_dir, relative + ".json")
+            if not os.path.exists(out_path):
+                jobs.append((os.path.getsize(path), path, out_path))
+    return [(path, out_path) for _, path, out_path in sorted(jobs, reverse=True)]
+
+
+def run_batch(input_dir, output_dir, workers=None, model_name="base", quantize=False, turn_gap_seconds=2.5):
+    """Transcribe every recording under `input_dir` across a process pool.
+
+    Finished recordings (an output JSON exists) are skipped and partially
+    done ones resume from their checkpoint, so a crashed or interrupted job
+    can simply be rerun. Torch threads are split between the workers so the
+    pool uses every core without oversubscribing them.
+    """
+    workers = workers or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    jobs = find_recordings(input_dir, output_dir)
+    log.info("%d recordings to process with %d workers x %d threads", len(jobs), workers, threads)
+
+    for _, out_path in jobs:
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+
+    done, failed = [], []
+    # spawn: torch does not survive fork once its thread pools exist
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker,
+                             initargs=(model_name, quantize, threads)) as pool:
+        futures = {pool.submit(process_recording, path, out_path, turn_gap_seconds): path for path, out_path in jobs}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                log.error("Failed on %s: %s", path, e)
+                failed.append(path)
+                continue
+            done.append(result)
+            log.info("[%d/%d] %s: %d turns in %.1fs", len(done) + len(failed), len(jobs),
+                     path, result["turns"], result["seconds"])
+    return {"processed": len(done), "failed": failed}
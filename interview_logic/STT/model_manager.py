@@ -0,0 +1,142 @@
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+log = logging.getLogger("interview.stt.models")
+
+# name -> (whisper model size, int8 dynamic quantization)
+VARIANTS = {
+    "base": ("base", False),
+    "base-int8": ("base", True),
+    "small": ("small", False),
+    "small-int8": ("small", True),
+    "tiny": ("tiny", False),
+    "tiny-int8": ("tiny", True),
+}
+
+# Most accurate first; choose() walks this list until one fits the budget
+ACCURACY_ORDER = ["small", "small-int8", "base", "base-int8", "tiny", "tiny-int8"]
+
+
+class ModelNotReady(Exception):
+    pass
+
+
+class ModelManager:
+    """Owns the Whisper models so the web server doesn't load them at import.
+
+    start() loads the configured variants on a background thread (default
+    variant first) and runs a warm-up inference on each, so "/" and
+    "/static" are served immediately and status() can report readiness.
+    preload() does the same synchronously; call it before workers fork
+    (e.g. gunicorn --preload) so the weights are shared copy-on-write.
+
+    Each variant keeps a running estimate of inference ms per 30s Whisper
+    window (seeded by the warm-up run), which choose() uses to pick a variant
+    for a latency budget.
+    """
+
+    def __init__(self, variants=("base",), default="base", warmup=True):
+        unknown = [v for v in variants if v not in VARIANTS]
+        if unknown:
+            raise ValueError(f"Unknown Whisper variants: {unknown} (known: {list(VARIANTS)})")
+        if default not in variants:
+            raise ValueError(f"Default variant {default!r} is not in {list(variants)}")
+        self.variants = [default] + [v for v in variants if v != default]
+        self.default = default
+        self.warmup = warmup
+        self._models = {}
+        self._info = {name: {"state": "pending"} for name in self.variants}
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None and not self._ready.is_set():
+            self._thread = threading.Thread(target=self._load_all, name="whisper-loader", daemon=True)
+            self._thread.start()
+
+    def preload(self):
+        self._load_all()
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def loaded_count(self):
+        return len(self._models)
+
+    def get(self, variant=None):
+        variant = variant or self.default
+        model = self._models.get(variant)
+        if model is None:
+            raise ModelNotReady(f"Whisper variant {variant!r} is {self._info.get(variant, {}).get('state', 'unknown')}")
+        return model
+
+    def choose(self, latency_budget_ms=None, audio_seconds=0.0):
+        """Most accurate loaded variant whose estimated latency fits the budget;
+        the fastest loaded one if none does."""
+        loaded = [v for v in ACCURACY_ORDER if v in self._models]
+        if not loaded:
+            raise ModelNotReady("No Whisper model loaded yet")
+        if latency_budget_ms is None:
+            return self.default if self.default in self._models else loaded[0]
+
+        windows = max(1, math.ceil(audio_seconds / 30))
+
+        def estimate(variant):
+            return (self._info[variant].get("ms_per_window") or 0) * windows
+
+        for variant in loaded:
+            if estimate(variant) <= latency_budget_ms:
+                return variant
+        return min(loaded, key=estimate)
+
+    def record(self, variant, audio_seconds, inference_ms):
+        """Feed a real measurement back into the variant's latency estimate."""
+        if variant not in self._info:
+            return
+        info = self._info[variant]
+        sample = inference_ms / max(1, math.ceil(audio_seconds / 30))
+        previous = info.get("ms_per_window")
+        info["ms_per_window"] = round(sample if previous is None else 0.8 * previous + 0.2 * sample, 1)
+
+    def status(self):
+        return {"ready": self.is_ready(), "default": self.default, "variants": self._info}
+
+    def _load_all(self):
+        for variant in self.variants:
+            if variant in self._models:
+                continue
+            info = self._info[variant]
+            info["state"] = "loading"
+            model_name, quantize = VARIANTS[variant]
+            try:
+                # Imported here so that importing the API doesn't pull in torch,
+                # and inside the try so a missing whisper marks the variant failed
+                from interview_logic.STT.whisper_stt import WhisperSTT
+
+                started = time.perf_counter()
+                stt = WhisperSTT(model_name, quantize=quantize)
+                info["load_seconds"] = round(time.perf_counter() - started, 2)
+
+                if self.warmup:
+                    # First inference pays for lazy kernel/graph setup; do it now
+                    info["state"] = "warming_up"
+                    clip = np.zeros(16000 * 2, np.float32)
+                    started = time.perf_counter()
+                    stt.model.transcribe(clip)
+                    info["warmup_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    info["ms_per_window"] = info["warmup_ms"]
+
+                self._models[variant] = stt
+                info["state"] = "ready"
+                log.info("Whisper %s ready", variant, extra={"fields": dict(info)})
+            except Exception as e:
+                info["state"] = "failed"
+                info["error"] = str(e)
+                log.exception("Failed to load Whisper %s", variant)
+
+            if variant == self.default and variant in self._models:
+                self._ready.set()
@@ -0,0 +1,96 @@
+import logging
+import threading
+
+from interview_logic.STT.model_manager import ModelManager, ModelNotReady
+from interview_logic.utils.engine_link import EngineError, EngineUnavailable
+
+log = logging.getLogger("interview.stt.remote")
+
+
+class RemoteSTT:
+    """WhisperSTT lookalike whose calls run in the engine worker. Blocking,
+    like the real thing, so TranscriptionPool threads drive it unchanged."""
+
+    def __init__(self, client, variant):
+        self.client = client
+        self.variant = variant
+
+    def transcribe(self, audio) -> str:
+        return self._call("transcribe", audio)
+
+    def transcribe_audio(self, audio, initial_prompt=None) -> dict:
+        return self._call("transcribe_audio", audio, initial_prompt)
+
+    def transcribe_batch(self, audios: list) -> list:
+        return self._call("transcribe_batch", audios)
+
+    def _call(self, op, *args):
+        # An unreachable or restarting worker is "not ready": /answer sends a 503
+        try:
+            return self.client.call(op, self.variant, *args)
+        except EngineUnavailable as e:
+            raise ModelNotReady(str(e))
+        except EngineError as e:
+            if e.kind == "ModelNotReady":
+                raise ModelNotReady(e.message)
+            raise
+
+
+class RemoteModels(ModelManager):
+    """ModelManager for an API process whose Whisper models live in the
+    engine worker (engine_worker.py).
+
+    Nothing is loaded here: start() polls the worker's status every
+    `poll_interval` seconds and exposes each ready variant as a RemoteSTT,
+    so readiness, /health and choose() work as they do in process, and a
+    worker restart shows up as "not ready" until it has reloaded.
+    """
+
+    def __init__(self, client, variants=("base",), default="base", poll_interval=2.0):
+        super().__init__(variants, default, warmup=False)
+        self.client = client
+        self.poll_interval = poll_interval
+        self._stopped = threading.Event()
+
+    def preload(self):
+        # Weights are the worker's concern; just wait until it reports ready
+        while not self._poll():
+            self._stopped.wait(self.poll_interval)
+
+    def _load_all(self):
+        while not self._stopped.is_set():
+            self._poll()
+            self._stopped.wait(self.poll_interval)
+
+    def _poll(self):
+        try:
+            status = self.client.call("status")
+        except EngineUnavailable as e:
+            if self._ready.is_set():
+                log.warning("Engine worker unreachable: %s", e)
+            self._models.clear()
+            self._ready.clear()
+            for info in self._info.values():
+                info["state"] = "unreachable"
+            return False
+
+        for variant, remote in status["variants"].items():
+            if variant not in self._info:
+                continue
+            info = self._info[variant]
+            for key, value in remote.items():
+                # Keep our own latency estimate once we have one; it includes the IPC hop
+                if key != "ms_per_window" or "ms_per_window" not in info:
+                    info[key] = value
+            if remote["state"] == "ready":
+                self._models.setdefault(variant, RemoteSTT(self.client, variant))
+            else:
+                self._models.pop(variant, None)
+        if self.default in self._models:
+            self._ready.set()
+        else:
+            self._ready.clear()
+        return self._ready.is_set()
+
+    def close(self):
+        self._stopped.set()
@@ -0,0 +1,109 @@
+from interview_logic.utils.audio_io import AudioDecodeError, decode_audio_bytes, SAMPLE_RATE
+from interview_logic.utils.vad import speech_bounds, speech_chunks
+
+
+class StreamingTranscriber:
+    """Incrementally transcribes one answer while it is still being recorded.
+
+    MediaRecorder chunks are appended as they arrive. Each update() decodes
+    the buffer and runs Whisper only on the audio after the last committed
+    segment, prompting it with the tail of the committed text as rolling
+    context. Segments that end more than `tail_seconds` before the end of the
+    buffer are considered stable and committed, so by the time the candidate
+    stops speaking only the last few seconds are left for finish().
+
+    With `vad` on, silence is kept away from Whisper as in /answer: leading
+    silence is skipped (and committed) before each pass, a window with no
+    speech is not transcribed at all, and finish() only sends the speech.
+    """
+
+    def __init__(self, stt, context_chars=200, tail_seconds=1.0, max_window_seconds=25, vad=True, input_format=None):
+        self.stt = stt
+        self.vad = vad
+        self.input_format = input_format  # ffmpeg demuxer of the recorder's container, if declared
+        self.context_chars = context_chars
+        self.tail_seconds = tail_seconds
+        self.max_window_seconds = max_window_seconds
+        self.buffer = bytearray()
+        self.committed_text = ""
+        self.committed_samples = 0
+        self.pending_text = ""
+
+    def add_chunk(self, data: bytes):
+        self.buffer.extend(data)
+
+    def text(self) -> str:
+        return (self.committed_text + self.pending_text).strip()
+
+    def update(self) -> str:
+        """Transcribe the uncommitted window and commit its stable segments."""
+        window = self._window()
+        if window is None:
+            return self.text()
+
+        if self.vad:
+            bounds = speech_bounds(window)
+            if bounds is None:
+                # Nothing (more) said: keep what the last pass heard, drop the
+                # silence but keep the tail, where speech may be starting
+                self.committed_text += self.pending_text
+                self.pending_text = ""
+                self.committed_samples += max(0, len(window) - int(self.tail_seconds * SAMPLE_RATE))
+                return self.text()
+            self.committed_samples += bounds[0]
+            window = window[bounds[0]:]
+
+        result = self.stt.transcribe_audio(window, initial_prompt=self._context())
+        window_seconds = len(window) / SAMPLE_RATE
+        stable_until = window_seconds - self.tail_seconds
+        if window_seconds >= self.max_window_seconds:
+            # Never let the window grow past Whisper's 30s context
+            stable_until = window_seconds
+
+        segments = result.get("segments", [])
+        committed_end = 0.0
+        pending = []
+        for segment in segments:
+            if segment["end"] <= stable_until and not pending:
+                self.committed_text += segment["text"]
+                committed_end = segment["end"]
+            else:
+                pending.append(segment["text"])
+
+        self.committed_samples += int(committed_end * SAMPLE_RATE)
+        self.pending_text = "".join(pending)
+        return self.text()
+
+    def finish(self) -> str:
+        """Transcribe whatever is left after the last commit and return the full text."""
+        window = self._window(final=True)
+        chunks = []
+        if window is not None:
+            chunks = speech_chunks(window) if self.vad else [window]
+        if chunks:
+            for chunk in chunks:
+                result = self.stt.transcribe_audio(chunk, initial_prompt=self._context())
+                self.committed_text += result["text"]
+        else:
+            self.committed_text += self.pending_text
+        self.pending_text = ""
+        return self.text()
+
+    def _window(self, final=False):
+        if not self.buffer:
+            return None
+        # webm clusters only decode from the start of the stream, so decode the
+        # whole buffer and slice; ffmpeg is cheap next to Whisper inference
+        try:
+            audio = decode_audio_bytes(bytes(self.buffer), input_format=self.input_format)
+        except AudioDecodeError:
+            if final:
+                raise
+            return None  # e.g. only the container header has arrived so far
+        window = audio[self.committed_samples:]
+        if len(window) < SAMPLE_RATE // 2:
+            return None
+        return window
+
+    def _context(self):
+        return self.committed_text[-self.context_chars:] or None
@@ -0,0 +1,159 @@
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TranscriptionQueueFull(Exception):
+    pass
+
+
+class TranscriptionPool:
+    """Runs Whisper off the event loop.
+
+    Clips are queued and picked up by `workers` batcher tasks. A batcher never
+    waits for company: it takes the clip at the head of the queue plus
+    whatever else is already waiting (up to `max_batch`) and sends them to
+    WhisperSTT.transcribe_batch in one executor call, so an idle server
+    starts at once and a busy one batches the clips that queued up behind
+    the running pass. Clips can name their own WhisperSTT (model variant);
+    only clips for the same model are batched together. Each WhisperSTT runs
+    one inference at a time (Whisper's decoder is not thread-safe), so extra
+    workers only add parallelism across variants; torch already uses every
+    core per pass.
+
+    Partial passes of streamed answers are background work: they are only
+    queued when nothing else is waiting, and queued answers always go first.
+    """
+
+    # Queue priorities; lower runs first
+    ANSWER = 0
+    PARTIAL = 1
+
+    def __init__(self, stt=None, workers=1, max_queue=32, max_batch=4):
+        self.stt = stt
+        self.workers = workers
+        self.max_batch = max_batch
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper")
+        self.max_queue = max_queue
+        self.queue = None
+        self._tasks = []
+        # Tie-breaker so equal priorities stay first in, first out
+        self._seq = itertools.count()
+
+    def _ensure_started(self):
+        # Created lazily so the queue binds to the server's running loop
+        if not self._tasks:
+            self.queue = asyncio.PriorityQueue(maxsize=self.max_queue)
+            self._tasks = [asyncio.create_task(self._batcher()) for _ in range(self.workers)]
+
+    async def transcribe(self, audio, stt=None):
+        """Queue one clip (float32 array or file path) and wait for its text.
+
+        Returns (text, timings) where timings holds queue_wait_ms,
+        inference_ms and batch_size. Raises TranscriptionQueueFull when the
+        queue is at capacity so callers can shed load instead of piling up.
+        """
+        return (await self.transcribe_all([audio], stt))[0]
+
+    async def transcribe_all(self, audios, stt=None):
+        """Queue all clips of one answer, or none of them when they don't all
+        fit, and return their (text, timings) in order."""
+        self._ensure_started()
+        if self.queue.qsize() + len(audios) > self.max_queue:
+            raise TranscriptionQueueFull(f"{self.queue.qsize()} clips already waiting")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for audio in audios:
+            future = loop.create_future()
+            self._put(self.ANSWER, (audio, stt or self.stt, future, time.perf_counter()))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def run(self, fn, partial=False):
+        """Queue a blocking Whisper call of its own, such as a streaming
+        StreamingTranscriber pass, behind the same bounded queue.
+
+        Returns (result, timings) like transcribe() and raises
+        TranscriptionQueueFull the same way, so streamed answers are shed
+        and timed like uploaded ones. A `partial` call is also refused while
+        any other work is waiting, and never runs ahead of it.
+        """
+        self._ensure_started()
+        if partial and not self.queue.empty():
+            raise TranscriptionQueueFull(f"{self.queue.qsize()} clips already waiting")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._put(self.PARTIAL if partial else self.ANSWER, (fn, None, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            raise TranscriptionQueueFull(f"{self.queue.qsize()} clips already waiting")
+        return await future
+
+    def _put(self, priority, item):
+        self.queue.put_nowait((priority, next(self._seq), item))
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [(await self.queue.get())[2]]
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait()[2])
+
+            groups, calls = {}, []
+            for item in batch:
+                if callable(item[0]):
+                    calls.append(item)
+                else:
+                    groups.setdefault(id(item[1]), []).append(item)
+            for group in groups.values():
+                await self._run(loop, group[0][1], group)
+            # In queue order, so a partial pass drained into the batch runs last
+            for item in calls:
+                await self._call(loop, item)
+            for _ in batch:
+                self.queue.task_done()
+
+    async def _run(self, loop, stt, batch):
+        started = time.perf_counter()
+        try:
+            texts = await loop.run_in_executor(
+                self.executor, stt.transcribe_batch, [audio for audio, _, _, _ in batch]
+            )
+        except Exception as e:
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        inference_ms = (time.perf_counter() - started) * 1000
+
+        for (_, _, future, queued_at), text in zip(batch, texts):
+            timings = {
+                "queue_wait_ms": round((started - queued_at) * 1000, 1),
+                "inference_ms": round(inference_ms, 1),
+                "batch_size": len(batch),
+            }
+            if not future.done():
+                future.set_result((text, timings))
+
+    async def _call(self, loop, item):
+        fn, _, future, queued_at = item
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(self.executor, fn)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        timings = {
+            "queue_wait_ms": round((started - queued_at) * 1000, 1),
+            "inference_ms": round((time.perf_counter() - started) * 1000, 1),
+            "batch_size": 1,
+        }
+        if not future.done():
+            future.set_result((result, timings))
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self.executor.shutdown(wait=False)
@@ -1,10 +1,84 @@
+import logging
+import threading
+
+import torch
 import whisper
 
+log = logging.getLogger("interview.stt")
+
+# Whisper works on 30 second windows; shorter clips can share one decode pass
+BATCH_MAX_SECONDS = 30
+# transcribe()'s defaults for when a greedy decode has failed and needs its
+# temperature fallback
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of every Linear layer (weights stored as int8,
+    activations quantized on the fly). Roughly halves the model's memory and
+    speeds up CPU decoding at a small accuracy cost."""
+    # Whisper wraps nn.Linear in its own subclass, which quantize_dynamic
+    # does not recognise; its forward only adds dtype casting we don't need in fp32
+    for module in model.modules():
+        if isinstance(module, whisper.model.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
 class WhisperSTT:
-    def __init__(self, model_name="base"):
-        self.model = whisper.load_model(model_name)
+    """One Whisper model. Inference is serialized per instance: Whisper's
+    decoder installs key/value cache hooks on the shared model for every
+    decode, so two decodes running on it at once corrupt each other."""
+
+    def __init__(self, model_name="base", quantize=False):
+        if quantize:
+            # Dynamic int8 quantization only exists for CPU kernels
+            self.model = quantize_int8(whisper.load_model(model_name, device="cpu"))
+        else:
+            self.model = whisper.load_model(model_name)
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio) -> str:
+        """Transcribe a file path or a float32 16 kHz NumPy array."""
+        if isinstance(audio, str):
+            log.debug("Transcribing %s", audio)
+        else:
+            log.debug("Transcribing %.1fs of audio", len(audio) / whisper.audio.SAMPLE_RATE)
+        with self._lock:
+            return self.model.transcribe(audio)["text"]
+
+    def transcribe_audio(self, audio, initial_prompt=None) -> dict:
+        """Transcribe a float32 16 kHz array and return Whisper's full result (text + segments)."""
+        with self._lock:
+            return self.model.transcribe(audio, initial_prompt=initial_prompt)
+
+    def transcribe_batch(self, audios: list) -> list:
+        """Transcribe several clips (paths or arrays), decoding the ones that
+        fit in one 30s window together in a single batched pass.
+
+        The batched pass is greedy only. A clip whose result transcribe()
+        would reject (repetitive or low-confidence text, the triggers for its
+        temperature fallback) is transcribed again on its own, so a clip's
+        text doesn't depend on whether it arrived alongside others."""
+        if len(audios) == 1:
+            return [self.transcribe(audios[0])]
+
+        audios = [whisper.load_audio(a) if isinstance(a, str) else a for a in audios]
+        texts = [None] * len(audios)
+        short = [i for i, audio in enumerate(audios) if len(audio) <= BATCH_MAX_SECONDS * whisper.audio.SAMPLE_RATE]
+
+        with self._lock:
+            if len(short) > 1:
+                log.debug("Batch decoding %d clips", len(short))
+                mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(audios[i])) for i in short]
+                batch = torch.stack(mels).to(self.model.device)
+                options = whisper.DecodingOptions(fp16=self.model.device.type == "cuda")
+                for i, result in zip(short, whisper.decode(self.model, batch, options)):
+                    if result.compression_ratio <= COMPRESSION_RATIO_THRESHOLD and result.avg_logprob >= LOGPROB_THRESHOLD:
+                        texts[i] = result.text
 
-    def transcribe(self, audio_path: str) -> str:
-        print(f"[Whisper] Transcribing {audio_path}...")
-        result = self.model.transcribe(audio_path)
-        return result["text"]
+            # Long answers need the sliding-window loop, rejected ones the fallback
+            for i, audio in enumerate(audios):
+                if texts[i] is None:
+                    texts[i] = self.model.transcribe(audio)["text"]
+        return texts
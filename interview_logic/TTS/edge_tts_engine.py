@@ -1,42 +1,71 @@
 import asyncio
-import tempfile
-import simpleaudio as sa
-from pydub import AudioSegment
-import edge_tts
-import os
+import logging
+from interview_logic.utils.audio_io import decode_pcm16
+
+log = logging.getLogger("interview.tts")
+
+# edge-tts returns 24 kHz mono MP3
+TTS_SAMPLE_RATE = 24000
 
 class EdgeTTS:
-    def __init__(self, voice="en-US-AriaNeural"):
+    def __init__(self, voice="en-US-AriaNeural", cache=None):
         self.voice = voice
+        self.cache = cache  # optional TTSCache shared across sessions
+
+    async def synthesize(self, text) -> bytes:
+        """Return the MP3 bytes for `text`, collected in memory."""
+        return b"".join([chunk async for chunk in self._produce(text)])
+
+    async def audio_for(self, text) -> bytes:
+        """MP3 bytes for `text`, served from the cache when one is configured."""
+        if self.cache is None:
+            return await self.synthesize(text)
+        return await self.cache.get(self.voice, text, self._produce)
+
+    async def stream(self, text):
+        """Yield MP3 chunks as edge-tts produces them so a client can start
+        playing on the first one. Cached clips are yielded in one piece; a
+        clip already being synthesized (e.g. prewarmed) is followed as it grows."""
+        chunks = self._produce(text) if self.cache is None else self.cache.stream(self.voice, text, self._produce)
+        async for chunk in chunks:
+            yield chunk
+
+    async def _produce(self, text):
+        communicate = self._communicate(text)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+
+    def _communicate(self, text):
+        # edge_tts (and aiohttp under it) is only imported once speech is needed
+        import edge_tts
+        return edge_tts.Communicate(text, voice=self.voice)
+
+    def prewarm(self, texts):
+        if self.cache is not None:
+            self.cache.prewarm(self.voice, texts, self._produce)
+
+    def cancel_prewarm(self, texts):
+        if self.cache is not None:
+            self.cache.cancel(self.voice, texts)
 
     async def speak(self, text):
+        """Play `text` on this machine's sound device (local/CLI use only;
+        the API streams audio to the browser instead)."""
         try:
-            communicate = edge_tts.Communicate(text, voice=self.voice)
-            # Create a temporary MP3 file to hold the audio data
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as mp3_tmp:
-                async for chunk in communicate.stream():
-                    if chunk["type"] == "audio":
-                        mp3_tmp.write(chunk["data"])
-                mp3_path = mp3_tmp.name
-
-            # Convert the MP3 file to WAV format
-            wav_path = mp3_path.replace(".mp3", ".wav")
-            AudioSegment.from_file(mp3_path).export(wav_path, format="wav")
-
-            # Play the WAV file using simpleaudio
-            wave_obj = sa.WaveObject.from_wave_file(wav_path)
-            play_obj = wave_obj.play()
+            import simpleaudio as sa
+            mp3_bytes = await self.audio_for(text)
+
+            # Decode MP3 -> 16-bit PCM through an ffmpeg pipe instead of temp files
+            loop = asyncio.get_running_loop()
+            pcm = await loop.run_in_executor(None, decode_pcm16, mp3_bytes, TTS_SAMPLE_RATE)
+
+            # Play the raw PCM buffer using simpleaudio
+            play_obj = sa.play_buffer(pcm.tobytes(), 1, 2, TTS_SAMPLE_RATE)
             play_obj.wait_done()  # Wait for the audio to finish
 
         except Exception as e:
-            print(f"[Error] TTS playback failed: {e}")
-        finally:
-            # Cleanup temporary files
-            try:
-                os.remove(mp3_path)
-                os.remove(wav_path)
-            except Exception as e:
-                print(f"[Error] Failed to clean up temporary files: {e}")
+            log.error("TTS playback failed: %s", e)
 
 # Example usage
 async def main():
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from interview_logic.utils.engine_link import EngineUnavailable
+
+log = logging.getLogger("interview.tts.remote")
+
+
+class RemoteTTSCache:
+    """Stats of the TTS cache held by the engine worker."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def stats(self):
+        try:
+            return self.client.call("tts_cache_stats")
+        except EngineUnavailable:
+            return {"state": "unreachable"}
+
+
+class RemoteTTS:
+    """EdgeTTS lookalike for an API process whose TTS (and its cache) lives in
+    the engine worker. stream() relays chunks as the worker produces them."""
+
+    def __init__(self, client):
+        self.client = client
+        self.cache = RemoteTTSCache(client)
+        # Prewarm requests are fire-and-forget; one thread keeps them in order
+        self._prewarm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-prewarm")
+
+    def prewarm(self, texts):
+        self._prewarm_executor.submit(self._prewarm, "tts_prewarm", list(texts))
+
+    def cancel_prewarm(self, texts):
+        self._prewarm_executor.submit(self._prewarm, "tts_cancel", list(texts))
+
+    async def audio_for(self, text) -> bytes:
+        return b"".join([chunk async for chunk in self.stream(text)])
+
+    async def stream(self, text):
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        stop = threading.Event()
+
+        def pump():
+            # Blocking reads from the worker, handed to the loop chunk by chunk
+            try:
+                for chunk in self.client.stream("tts_stream", text):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+                item = None
+            except Exception as e:
+                item = e
+            loop.call_soon_threadsafe(chunks.put_nowait, item)
+
+        loop.run_in_executor(None, pump)
+        try:
+            while True:
+                item = await chunks.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def _prewarm(self, op, texts):
+        try:
+            self.client.call(op, texts)
+        except Exception as e:
+            log.warning("Prewarm request failed: %s", e)
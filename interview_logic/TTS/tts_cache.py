@@ -0,0 +1,263 @@
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+
+log = logging.getLogger("interview.tts.cache")
+
+
+class _Synthesis:
+    """One in-flight synthesis: chunks accumulate as they are produced and any
+    number of followers read them as they arrive."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.readers = 0
+        self.task = None
+        self._changed = asyncio.Event()
+
+    def add(self, chunk):
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error=None):
+        self.done = True
+        self.error = error
+        self._notify()
+
+    def _notify(self):
+        # Wake everyone waiting on the current event, then arm a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self):
+        self.readers += 1
+        try:
+            i = 0
+            while True:
+                while i < len(self.chunks):
+                    yield self.chunks[i]
+                    i += 1
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._changed.wait()
+        finally:
+            self.readers -= 1
+
+
+class TTSCache:
+    """Content-addressed cache of synthesized audio.
+
+    Entries are keyed by sha256(voice, text) and held in a byte-bounded LRU.
+    With `disk_dir` set every synthesized clip is also written to disk (up to
+    `disk_max_bytes`, oldest files evicted first), so entries evicted from
+    memory (or lost on restart, or produced by another worker) are reloaded
+    from disk instead of re-synthesized.
+
+    All requests for a key that is not in memory share one synthesis task,
+    registered before anything is awaited: a streaming reader gets its chunks
+    as they are produced, even when the synthesis was started by a prewarm.
+    `produce(text)` is an async iterator of audio chunks.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, disk_max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._inflight = {}
+        self._background = set()
+        # key -> file size, oldest first; other workers' files are adopted on read
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    @staticmethod
+    def key(voice, text):
+        return hashlib.sha256(f"{voice}\0{text}".encode("utf-8")).hexdigest()
+
+    async def get(self, voice, text, produce):
+        """Return the whole clip for (voice, text)."""
+        return b"".join([chunk async for chunk in self.stream(voice, text, produce)])
+
+    async def stream(self, voice, text, produce):
+        """Yield audio for (voice, text): a cached clip in one piece, otherwise
+        the chunks of the shared synthesis as they arrive."""
+        key = self.key(voice, text)
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            yield audio
+            return
+
+        synthesis = self._inflight.get(key)
+        if synthesis is not None:
+            self.hits += 1
+        else:
+            synthesis = self._start(key, text, produce)
+        async for chunk in synthesis.follow():
+            yield chunk
+
+    def prewarm(self, voice, texts, produce):
+        """Synthesize `texts` in the background so later calls are cache hits."""
+        for text in texts:
+            key = self.key(voice, text)
+            if key not in self._entries and key not in self._inflight:
+                self._start(key, text, produce)
+
+    def cancel(self, voice, texts):
+        """Stop prewarms of `texts` that nobody is reading yet, e.g. a
+        speculative prefetch the conversation made unnecessary."""
+        for text in texts:
+            key = self.key(voice, text)
+            synthesis = self._inflight.get(key)
+            if synthesis is not None and not synthesis.readers:
+                # Unregistered first, so a later request starts a fresh synthesis
+                del self._inflight[key]
+                synthesis.task.cancel()
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "disk_files": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes if self.disk_dir else 0,
+            "disk_evictions": self.disk_evictions,
+        }
+
+    def _start(self, key, text, produce):
+        # Registered synchronously, so every later request for the key joins it
+        synthesis = _Synthesis()
+        self._inflight[key] = synthesis
+        task = synthesis.task = asyncio.create_task(self._synthesize(key, text, produce, synthesis))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return synthesis
+
+    async def _synthesize(self, key, text, produce, synthesis):
+        # Runs to completion even if the reader that started it goes away,
+        # so a disconnected client still leaves the clip cached
+        try:
+            audio = await self._load_from_disk(key)
+            if audio is not None:
+                self.disk_hits += 1
+                synthesis.add(audio)
+            else:
+                self.misses += 1
+                async for chunk in produce(text):
+                    synthesis.add(chunk)
+                audio = b"".join(synthesis.chunks)
+                await self._write_to_disk(key, audio)
+            self._put(key, audio)
+            synthesis.finish()
+        except Exception as e:
+            log.warning("Synthesis failed for %r: %s", text, e)
+            synthesis.finish(e)
+        finally:
+            if self._inflight.get(key) is synthesis:
+                del self._inflight[key]
+
+    def _put(self, key, audio):
+        if not audio or len(audio) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = audio
+        self._bytes += len(audio)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key[:2], key + ".mp3")
+
+    def _scan_disk(self):
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith(".mp3"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_mtime, name[:-len(".mp3")], st.st_size))
+        for _, key, size in sorted(files):
+            self._disk_track(key, size)
+        self._disk_evict()
+
+    def _disk_track(self, key, size):
+        old = self._disk.pop(key, None)
+        if old is not None:
+            self._disk_bytes -= old
+        self._disk[key] = size
+        self._disk_bytes += size
+
+    def _disk_evict(self):
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    async def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+
+        def read():
+            try:
+                with open(path, "rb") as f:
+                    audio = f.read()
+            except FileNotFoundError:
+                return None
+            # Refresh the mtime so the next scan keeps recently used clips
+            os.utime(path)
+            return audio
+
+        audio = await asyncio.get_running_loop().run_in_executor(None, read)
+        if audio is not None:
+            self._disk_track(key, len(audio))
+        return audio
+
+    async def _write_to_disk(self, key, audio):
+        if not self.disk_dir or not audio or len(audio) > self.disk_max_bytes:
+            return
+        path = self._path(key)
+
+        def write():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so other workers never read a half-written clip
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+
+        await asyncio.get_running_loop().run_in_executor(None, write)
+        self._disk_track(key, len(audio))
+        # Deleting a handful of files is quick enough to do inline
+        self._disk_evict()
@@ -0,0 +1,105 @@
+import os
+
+# All runtime settings come from environment variables so one codebase can run
+# as a single dev process or as several uvicorn workers sharing a backend.
+
+# Session storage: "memory" (single process) or "sqlite" (shared between workers)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "data/sessions.sqlite3")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "7200"))
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "5000"))
+# SQLite backend: how long a worker may hold a session's row lease before
+# another worker can take it over (only matters if a worker dies mid-request)
+SESSION_LEASE_SECONDS = int(os.getenv("SESSION_LEASE_SECONDS", "120"))
+
+# Transcription worker pool (see interview_logic/STT/transcription_pool.py)
+# Each Whisper model runs one inference at a time, so more than one worker only
+# helps when several variants are loaded (STT_MODEL_VARIANTS)
+STT_WORKERS = int(os.getenv("STT_WORKERS", "1"))
+STT_MAX_QUEUE = int(os.getenv("STT_MAX_QUEUE", "32"))
+STT_MAX_BATCH = int(os.getenv("STT_MAX_BATCH", "4"))
+
+# Minimum gap between partial Whisper passes on a streamed answer
+STREAM_UPDATE_INTERVAL_MS = int(os.getenv("STREAM_UPDATE_INTERVAL_MS", "1500"))
+# Streamed answers transcribed at once; further sockets are refused and the
+# browser uploads the answer instead. Every partial pass is a full Whisper
+# inference, so the cap is STREAM_PER_MODEL per loaded model unless
+# STREAM_MAX_CONCURRENT pins a fixed total
+STREAM_PER_MODEL = int(os.getenv("STREAM_PER_MODEL", "2"))
+STREAM_MAX_CONCURRENT = int(os.getenv("STREAM_MAX_CONCURRENT", "0"))
+
+# TTS audio cache: in-memory LRU bound plus on-disk store (empty string disables disk)
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "data/tts_cache") or None
+# Oldest clips are deleted once the disk store passes this size
+TTS_CACHE_DISK_MAX_BYTES = int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# n8n decision webhook
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "https://hudmarr.app.n8n.cloud/webhook/fb613c07-aa88-4fbd-a3c9-ba4cdf7387a9")
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+WEBHOOK_RETRIES = int(os.getenv("WEBHOOK_RETRIES", "2"))
+WEBHOOK_BREAKER_THRESHOLD = int(os.getenv("WEBHOOK_BREAKER_THRESHOLD", "5"))
+WEBHOOK_BREAKER_RESET_SECONDS = float(os.getenv("WEBHOOK_BREAKER_RESET_SECONDS", "30"))
+WEBHOOK_GZIP = os.getenv("WEBHOOK_GZIP", "0") == "1"
+# "full" (whole transcript every turn), "budget" or "delta"; see LLM/payload_builder.py
+WEBHOOK_PAYLOAD_MODE = os.getenv("WEBHOOK_PAYLOAD_MODE", "budget")
+WEBHOOK_TOKEN_BUDGET = int(os.getenv("WEBHOOK_TOKEN_BUDGET", "1500"))
+# Who decides follow-up vs next question: "webhook" (n8n), "local" (in-process
+# rules, no network) or "webhook+local" (n8n, local rules when it is down)
+DECISION_BACKEND = os.getenv("DECISION_BACKEND", "webhook")
+
+# Phrases synthesized at startup so common interviewer lines never wait on edge-tts
+TTS_PREWARM_PHRASES = [
+    "Hello, welcome to this interview!",
+    "Please input your first custom question.",
+    "Thank you. Let's move on to the next question.",
+]
+
+# Answer upload format offered to the browser (GET /audio_formats): "pcm16"
+# is 16 kHz mono WAV (256 kbit/s) read without ffmpeg; "opus" is the webm/opus
+# recording at UPLOAD_OPUS_BITRATE, far fewer bytes but decoded by ffmpeg
+UPLOAD_AUDIO_FORMAT = os.getenv("UPLOAD_AUDIO_FORMAT", "pcm16")
+UPLOAD_OPUS_BITRATE = int(os.getenv("UPLOAD_OPUS_BITRATE", "32000"))
+
+# Server-side voice activity detection before Whisper (interview_logic/utils/vad.py)
+VAD_ENABLED = os.getenv("VAD_ENABLED", "1") == "1"
+
+# Whisper model variants (see interview_logic/STT/model_manager.py), e.g. "base,base-int8,tiny"
+STT_MODEL_VARIANTS = [v.strip() for v in os.getenv("STT_MODEL_VARIANTS", "base").split(",") if v.strip()]
+STT_DEFAULT_VARIANT = os.getenv("STT_DEFAULT_VARIANT", "base")
+STT_WARMUP = os.getenv("STT_WARMUP", "1") == "1"
+# Load models at import time instead of in the background, for pre-fork servers
+# (gunicorn --preload -k uvicorn.workers.UvicornWorker) so workers share weights
+STT_PRELOAD = os.getenv("STT_PRELOAD", "0") == "1"
+
+# "inprocess" loads Whisper and TTS in each API process; "remote" reaches
+# them in engine_worker.py over a local socket ("host:port" or a Unix socket
+# path), so API workers start without torch and share one set of engines
+ENGINE_MODE = os.getenv("ENGINE_MODE", "inprocess")
+ENGINE_ADDRESS = os.getenv("ENGINE_ADDRESS", "127.0.0.1:6100")
+# Required in remote mode, with no default: both ends unpickle what they
+# receive, so anyone who knows the key can run code in the API and the worker
+ENGINE_AUTHKEY = os.getenv("ENGINE_AUTHKEY", "")
+ENGINE_CONNECTIONS = int(os.getenv("ENGINE_CONNECTIONS", str(STT_WORKERS + 8)))
+
+# Logging (see interview_logic/utils/logs.py): level, "text" or "json", and the
+# share of INFO/DEBUG lines kept (warnings and errors are never sampled out)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+# Per-turn tracing kept in memory for /trace; histograms are exported on /metrics
+TRACE_TURNS_PER_SESSION = int(os.getenv("TRACE_TURNS_PER_SESSION", "20"))
+
+# Deduplication: identical webhook payloads share one call and are cached for
+# the TTL; /answer responses are kept per session under the client's request_id
+WEBHOOK_CACHE_TTL_SECONDS = float(os.getenv("WEBHOOK_CACHE_TTL_SECONDS", "300"))
+WEBHOOK_CACHE_MAX_ENTRIES = int(os.getenv("WEBHOOK_CACHE_MAX_ENTRIES", "1000"))
+ANSWER_REPLAY_KEEP = int(os.getenv("ANSWER_REPLAY_KEEP", "8"))
+
+# Append-only transcript log for the memory session backend (empty disables):
+# sessions are restored from it on startup. Writes are fsynced in batches
+# gathered over TRANSCRIPT_LOG_FLUSH_MS.
+TRANSCRIPT_LOG_PATH = os.getenv("TRANSCRIPT_LOG_PATH", "data/transcripts.jsonl")
+TRANSCRIPT_LOG_FLUSH_MS = int(os.getenv("TRANSCRIPT_LOG_FLUSH_MS", "50"))
+TRANSCRIPT_LOG_FSYNC = os.getenv("TRANSCRIPT_LOG_FSYNC", "1") == "1"
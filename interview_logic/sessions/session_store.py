@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from interview_logic.sessions.transcript import json_default
+from interview_logic.sessions.transcript_log import TranscriptLog
+
+log = logging.getLogger("interview.sessions")
+
+
+def new_session_state(mode=None):
+    # Same shape the old module-level `state` dict in api.py had
+    return {
+        "mode": mode,
+        "questions": [],
+        "index": 0,
+        "transcript": [],
+        "questions_asked": 0,
+        "is_interview_complete": False,
+        "transcript_generation": 0,
+    }
+
+
+class InMemorySessionStore:
+    """Keeps interview sessions in process memory with TTL + LRU eviction.
+
+    Every session has its own asyncio.Lock so requests for one candidate are
+    serialized while other candidates proceed in parallel. With a
+    TranscriptLog every save is appended to it and the sessions it holds
+    are restored on startup, so interviews survive a restart; finished
+    interviews that expire are archived in the log instead of deleted.
+    """
+
+    def __init__(self, ttl_seconds=7200, max_sessions=5000, transcript_log=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session_id -> (last_access, state)
+        self._locks = {}
+        self.transcript_log = transcript_log
+        if transcript_log is not None:
+            self._restore()
+
+    def create(self, mode=None) -> str:
+        session_id = uuid.uuid4().hex
+        self.save(session_id, new_session_state(mode))
+        return session_id
+
+    def get(self, session_id):
+        if not session_id:
+            return None
+        item = self._load(session_id)
+        if item is None:
+            return None
+        last_access, state = item
+        if time.monotonic() - last_access > self.ttl_seconds:
+            self.delete(session_id)
+            return None
+        self._touch(session_id, state)
+        return state
+
+    def save(self, session_id, state):
+        self._touch(session_id, state)
+        if self.transcript_log is not None:
+            self.transcript_log.sync(session_id, state)
+        self.evict_expired()
+
+    def delete(self, session_id):
+        item = self._sessions.pop(session_id, None)
+        self._locks.pop(session_id, None)
+        if self.transcript_log is not None:
+            if item is not None and item[1].get("is_interview_complete"):
+                # Leaves memory but stays in the log for /export
+                self.transcript_log.archive(session_id)
+            else:
+                self.transcript_log.delete(session_id)
+
+    # Async handlers go through these; a store whose calls can block (SQLite)
+    # moves them off the event loop
+    async def acreate(self, mode=None) -> str:
+        return self.create(mode)
+
+    async def aget(self, session_id):
+        return self.get(session_id)
+
+    async def asave(self, session_id, state):
+        self.save(session_id, state)
+
+    def lock(self, session_id) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            if not self.exists(session_id):
+                # Not kept: delete/eviction only clean up locks of real sessions,
+                # so registering one per unknown id would grow without bound.
+                # The caller's get_session() turns this into a 404 anyway.
+                return asyncio.Lock()
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+    def exists(self, session_id) -> bool:
+        return session_id in self._sessions
+
+    def evict_expired(self):
+        now = time.monotonic()
+        # OrderedDict is kept in access order, so expired entries sit at the front
+        while self._sessions:
+            session_id, (last_access, _) = next(iter(self._sessions.items()))
+            if now - last_access <= self.ttl_seconds and len(self._sessions) <= self.max_sessions:
+                break
+            if self._locks.get(session_id) is not None and self._locks[session_id].locked():
+                # Never drop a session that has a request in flight
+                self._sessions.move_to_end(session_id)
+                break
+            self.delete(session_id)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _load(self, session_id):
+        return self._sessions.get(session_id)
+
+    def _restore(self):
+        now, now_monotonic = time.time(), time.monotonic()
+        logged = sorted(self.transcript_log.replay().items(), key=lambda item: item[1][0])
+        recent = [(session_id, item) for session_id, item in logged if now - item[0] <= self.ttl_seconds]
+        live = {
+            session_id: (ts, {**new_session_state(), **state})
+            for session_id, (ts, state) in recent[-self.max_sessions:]
+        }
+        archived = {
+            session_id: item for session_id, item in logged
+            if session_id not in live and item[1].get("is_interview_complete")
+        }
+        for session_id, (ts, state) in live.items():
+            # Carry over how long ago the session was last used
+            self._sessions[session_id] = (now_monotonic - (now - ts), state)
+        self.transcript_log.compact(live, archived)
+        if live or archived:
+            log.info("Restored %d sessions from %s (%d finished ones archived)",
+                     len(live), self.transcript_log.path, len(archived))
+
+    def _touch(self, session_id, state):
+        self._sessions[session_id] = (time.monotonic(), state)
+        self._sessions.move_to_end(session_id)
+
+
+class SQLiteSessionStore(InMemorySessionStore):
+    """Session store backed by a SQLite file so several uvicorn workers can
+    share sessions. State is stored as JSON and re-read on every request.
+    Finished interviews are kept past the TTL (and the count limit), so
+    they can still be exported.
+
+    lock() serializes requests for a session across workers: on top of the
+    in-process lock it takes a lease on the session's row (lease_owner,
+    lease_until), polling while another worker holds it. A lease expires
+    after `lease_seconds`, so a crashed worker can't block a session for
+    good. The async accessors run SQLite in a thread, so a busy database
+    never stalls the event loop.
+    """
+
+    def __init__(self, db_path, ttl_seconds=7200, max_sessions=5000, sweep_interval=30,
+                 lease_seconds=120, lease_poll_interval=0.05):
+        super().__init__(ttl_seconds=ttl_seconds, max_sessions=max_sessions)
+        self.db_path = db_path
+        self.sweep_interval = sweep_interval
+        self.lease_seconds = lease_seconds
+        self.lease_poll_interval = lease_poll_interval
+        self._last_sweep = 0.0
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " complete INTEGER NOT NULL DEFAULT 0,"
+                " lease_owner TEXT,"
+                " lease_until REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            for column, definition in (("complete", "INTEGER NOT NULL DEFAULT 0"),
+                                       ("lease_owner", "TEXT"),
+                                       ("lease_until", "REAL NOT NULL DEFAULT 0")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE sessions ADD COLUMN {column} {definition}")
+
+    def get(self, session_id):
+        if not session_id:
+            return None
+        row = self._conn().execute(
+            "SELECT data, updated_at, complete FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[1] > self.ttl_seconds and not row[2]:
+            self.delete(session_id)
+            return None
+        return json.loads(row[0])
+
+    def save(self, session_id, state):
+        with self._conn() as conn:
+            conn.execute(
+                # An upsert, not INSERT OR REPLACE, which would reset the lease columns
+                "INSERT INTO sessions (id, data, updated_at, complete) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(id) DO UPDATE SET"
+                " data = excluded.data, updated_at = excluded.updated_at, complete = excluded.complete",
+                (session_id, json.dumps(state, default=json_default), time.time(),
+                 int(bool(state.get("is_interview_complete")))),
+            )
+        self.evict_expired()
+
+    def delete(self, session_id):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        self._locks.pop(session_id, None)
+
+    def evict_expired(self):
+        # Sweeping the table is not free, so do it at most every sweep_interval
+        now = time.time()
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        with self._conn() as conn:
+            # Never a session with a request in flight in some worker
+            conn.execute("DELETE FROM sessions WHERE updated_at < ? AND NOT complete AND lease_until < ?",
+                         (now - self.ttl_seconds, now))
+            conn.execute(
+                "DELETE FROM sessions WHERE NOT complete AND lease_until < ? AND id NOT IN"
+                " (SELECT id FROM sessions WHERE NOT complete ORDER BY updated_at DESC LIMIT ?)",
+                (now, self.max_sessions),
+            )
+        for session_id in [sid for sid, lock in self._locks.items() if not lock.locked()]:
+            self._locks.pop(session_id, None)
+
+    def exists(self, session_id) -> bool:
+        row = self._conn().execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row is not None
+
+    async def acreate(self, mode=None) -> str:
+        return await _in_thread(self.create, mode)
+
+    async def aget(self, session_id):
+        return await _in_thread(self.get, session_id)
+
+    async def asave(self, session_id, state):
+        await _in_thread(self.save, session_id, state)
+
+    def lock(self, session_id):
+        # Idle locks are pruned by evict_expired(); a request for an unknown id
+        # gets no lease and the caller's 404
+        return _SessionLease(self, session_id)
+
+    def _take_lease(self, session_id, owner):
+        """True once `owner` holds the lease, False while another worker
+        holds it, None when there is no such session."""
+        now = time.time()
+        with self._conn() as conn:
+            taken = conn.execute(
+                "UPDATE sessions SET lease_owner = ?, lease_until = ? WHERE id = ? AND lease_until < ?",
+                (owner, now + self.lease_seconds, session_id, now),
+            ).rowcount
+            if taken:
+                return True
+            return False if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() else None
+
+    def _release_lease(self, session_id, owner):
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE sessions SET lease_owner = NULL, lease_until = 0 WHERE id = ? AND lease_owner = ?",
+                (session_id, owner),
+            )
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+async def _in_thread(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+class _SessionLease:
+    """SQLiteSessionStore.lock(): the in-process lock, then the row lease."""
+
+    def __init__(self, store, session_id):
+        self.store = store
+        self.session_id = session_id
+        self.owner = None
+        self._lock = store._locks.setdefault(session_id, asyncio.Lock())
+
+    def locked(self):
+        return self._lock.locked()
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        try:
+            owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+            while True:
+                taken = await _in_thread(self.store._take_lease, self.session_id, owner)
+                if taken is not False:
+                    break
+                await asyncio.sleep(self.store.lease_poll_interval)
+            self.owner = owner if taken else None
+        except BaseException:
+            self._lock.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        try:
+            if self.owner is not None:
+                await _in_thread(self.store._release_lease, self.session_id, self.owner)
+        finally:
+            self.owner = None
+            self._lock.release()
+
+
+def create_session_store(backend="memory", db_path=None, ttl_seconds=7200, max_sessions=5000,
+                         log_path=None, log_flush_interval=0.05, log_fsync=True, lease_seconds=120):
+    if backend == "memory":
+        # SQLite already persists every session; the log is what makes memory durable
+        transcript_log = TranscriptLog(log_path, flush_interval=log_flush_interval, fsync=log_fsync) if log_path else None
+        return InMemorySessionStore(ttl_seconds=ttl_seconds, max_sessions=max_sessions, transcript_log=transcript_log)
+    if backend == "sqlite":
+        return SQLiteSessionStore(db_path, ttl_seconds=ttl_seconds, max_sessions=max_sessions, lease_seconds=lease_seconds)
+    raise ValueError(f"Unknown session backend: {backend}")
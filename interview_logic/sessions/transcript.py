@@ -0,0 +1,129 @@
+class TranscriptEntry:
+    """One transcript line, stored in __slots__ instead of a per-entry dict.
+
+    Reads like the dicts it replaces (entry["text"], entry.get(...), `in`,
+    dict(entry)) so code that handles entries needs no changes; unset
+    optional fields are simply absent. Keys outside FIELDS go to `extra`.
+    """
+
+    FIELDS = ("speaker", "text", "question_number", "is_followup", "is_followup_answer",
+              "transition_to", "start", "end")
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, speaker, text, question_number=None, is_followup=None, is_followup_answer=None,
+                 transition_to=None, start=None, end=None, extra=None):
+        self.speaker = speaker
+        self.text = text
+        self.question_number = question_number
+        self.is_followup = is_followup
+        self.is_followup_answer = is_followup_answer
+        self.transition_to = transition_to
+        self.start = start
+        self.end = end
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        known = {key: value for key, value in data.items() if key in cls.FIELDS}
+        extra = {key: value for key, value in data.items() if key not in cls.FIELDS}
+        return cls(**known, extra=extra or None)
+
+    def to_dict(self):
+        data = {key: getattr(self, key) for key in self.FIELDS if getattr(self, key) is not None}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def copy(self) -> dict:
+        # Callers copy entries to annotate them, so hand back a plain dict
+        return self.to_dict()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra = {**(self.extra or {}), key: value}
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __eq__(self, other):
+        if isinstance(other, (TranscriptEntry, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TranscriptEntry({self.to_dict()!r})"
+
+
+def entry_dict(entry) -> dict:
+    return entry.to_dict() if isinstance(entry, TranscriptEntry) else entry
+
+
+def json_default(value):
+    # json.dumps(..., default=json_default) for states holding TranscriptEntry
+    if isinstance(value, TranscriptEntry):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def is_question_entry(entry) -> bool:
+    # A main question, as opposed to a follow-up or a transition line
+    return entry.get("speaker") == "AI" and not entry.get("is_followup") and not entry.get("transition_to")
+
+
+def append_entry(state, entry) -> TranscriptEntry:
+    """Append to the session transcript, numbering questions as they are written.
+
+    The transcript is append-only, so question_number is fixed at write time
+    and readers never have to rescan earlier entries.
+    """
+    entry = TranscriptEntry.from_dict(entry)
+    if is_question_entry(entry):
+        state["questions_asked"] = state.get("questions_asked", 0) + 1
+        entry.question_number = state["questions_asked"]
+    state["transcript"].append(entry)
+    return entry
+
+
+def reset_transcript(state):
+    state["transcript"] = []
+    state["questions_asked"] = 0
+    # Lets the transcript log tell a restarted interview from a shorter one
+    state["transcript_generation"] = state.get("transcript_generation", 0) + 1
+
+
+def transcript_mark(state):
+    """A point to roll back to with rollback_transcript()."""
+    return len(state["transcript"]), state.get("questions_asked", 0)
+
+
+def rollback_transcript(state, mark):
+    """Drop entries appended after `mark`, for a turn that failed before it
+    was saved; entries that were already saved must never be removed."""
+    length, questions_asked = mark
+    del state["transcript"][length:]
+    state["questions_asked"] = questions_asked
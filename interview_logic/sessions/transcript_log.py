@@ -0,0 +1,284 @@
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from interview_logic.sessions.transcript import TranscriptEntry, entry_dict
+
+log = logging.getLogger("interview.sessions.log")
+
+# Session fields worth restoring after a restart; everything else on the
+# state (summary cache, webhook offsets, replayed responses) is rebuilt lazily
+META_KEYS = ("mode", "questions", "index", "questions_asked", "is_interview_complete", "transcript_generation")
+
+
+class TranscriptLogBusy(RuntimeError):
+    """Another process already has the log open."""
+
+
+class TranscriptLog:
+    """Append-only JSONL log of session changes.
+
+    sync() is called on every session save and appends only what changed:
+    the new transcript entries ("append"), a restart of the transcript
+    ("reset"), and the small per-session fields in META_KEYS ("meta") when
+    they differ from the last logged value. Lines are handed to a writer
+    thread that writes whatever has accumulated in one go and fsyncs once
+    per batch (group commit), waiting `flush_interval` seconds to let a
+    batch build up. Request handlers never block on the disk; a crash can
+    lose at most the last batch. fsync=False leaves flushing to the OS.
+
+    replay() rebuilds session states from the log; compact() rewrites it
+    with only the sessions still alive plus the finished ones, which are
+    archived rather than deleted so they stay exportable for good. An index
+    of each session's line offsets is kept in memory, so locate() and
+    iter_entries() read just that session's lines.
+
+    One process owns the log: a second TranscriptLog on the same path
+    (e.g. another uvicorn worker) raises TranscriptLogBusy, since its
+    compaction would replace the file under the first one's appends.
+    """
+
+    def __init__(self, path, flush_interval=0.05, fsync=True):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        log_dir = os.path.dirname(path)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        # A separate lock file, so compact()'s os.replace doesn't drop the lock
+        self._lock_file = open(path + ".lock", "a+b")
+        try:
+            _lock_exclusive(self._lock_file)
+        except OSError:
+            self._lock_file.close()
+            raise TranscriptLogBusy(
+                f"{path} is already in use by another process; run several workers with"
+                " SESSION_BACKEND=sqlite, or give each process its own TRANSCRIPT_LOG_PATH"
+            )
+        self._logged = {}  # session_id -> (transcript generation, entries logged, meta json)
+        self._index = {}  # session_id -> [offset of latest meta line, offsets of current entries]
+        self._index_lock = threading.Lock()
+        self._pending = []
+        self._appended = 0
+        self._written = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._file_lock = threading.Lock()
+        self._file = open(path, "ab")
+        self.stats = {"records": 0, "batches": 0, "fsyncs": 0, "bytes": 0}
+        self._thread = threading.Thread(target=self._writer, name="transcript-log", daemon=True)
+        self._thread.start()
+
+    def sync(self, session_id, state):
+        generation = state.get("transcript_generation", 0)
+        logged_generation, logged_entries, logged_meta = self._logged.get(session_id, (0, 0, None))
+        transcript = state.get("transcript", [])
+        records = []
+        if generation != logged_generation or len(transcript) < logged_entries:
+            records.append({"op": "reset"})
+            logged_entries = 0
+        for entry in transcript[logged_entries:]:
+            records.append({"op": "append", "entry": entry_dict(entry)})
+
+        meta_values = {key: state.get(key) for key in META_KEYS}
+        meta = json.dumps(meta_values, separators=(",", ":"))
+        if meta != logged_meta:
+            records.append({"op": "meta", "meta": meta_values})
+
+        if records:
+            self._write(session_id, records)
+        self._logged[session_id] = (generation, len(transcript), meta)
+
+    def delete(self, session_id):
+        if self._logged.pop(session_id, None) is not None:
+            self._write(session_id, [{"op": "delete"}])
+
+    def archive(self, session_id):
+        """Stop tracking a finished session that left memory; its lines stay
+        in the log (compact() keeps finished sessions) for /export."""
+        self._logged.pop(session_id, None)
+
+    def replay(self):
+        """{session_id: (last_write_time, state)} for every session in the log.
+
+        A torn last line (crash mid-write) is skipped."""
+        self.flush()
+        sessions = {}
+        with self._index_lock:
+            self._index = {}
+        for offset, record in self._records():
+            self._index_record(record, offset)
+            session_id = record["sid"]
+            op = record["op"]
+            if op == "delete":
+                sessions.pop(session_id, None)
+                continue
+            if session_id not in sessions:
+                sessions[session_id] = (record["ts"], {"transcript": []})
+            state = sessions[session_id][1]
+            if op == "append":
+                state["transcript"].append(TranscriptEntry.from_dict(record["entry"]))
+            elif op == "reset":
+                state["transcript"] = []
+            elif op == "meta":
+                state.update(record["meta"])
+            sessions[session_id] = (record["ts"], state)
+        return sessions
+
+    def compact(self, sessions, archived=None):
+        """Rewrite the log to hold just `sessions` and the finished sessions in
+        `archived` (both {session_id: (ts, state)}); only `sessions` are then
+        tracked for changes. Meant for startup, before requests start appending."""
+        self.flush()
+        tmp = self.path + ".compact"
+        index = {}
+        with open(tmp, "wb") as f:
+            for tracked, group in ((False, archived or {}), (True, sessions)):
+                for session_id, (ts, state) in group.items():
+                    offsets = array("q")
+                    for entry in state.get("transcript", []):
+                        offsets.append(f.tell())
+                        f.write(self._line(session_id, ts, {"op": "append", "entry": entry_dict(entry)}))
+                    meta_values = {key: state.get(key) for key in META_KEYS}
+                    meta = json.dumps(meta_values, separators=(",", ":"))
+                    index[session_id] = [f.tell(), offsets]
+                    f.write(self._line(session_id, ts, {"op": "meta", "meta": meta_values}))
+                    if tracked:
+                        self._logged[session_id] = (state.get("transcript_generation", 0), len(state.get("transcript", [])), meta)
+            f.flush()
+            os.fsync(f.fileno())
+        with self._file_lock:
+            self._file.close()
+            os.replace(tmp, self.path)
+            self._file = open(self.path, "ab")
+            with self._index_lock:
+                self._index = index
+
+    def locate(self, session_id):
+        """A session's latest META_KEYS values, or None for a session that is
+        not in the log. Reads one line, found through the index."""
+        self.flush()
+        with self._index_lock:
+            item = self._index.get(session_id)
+            meta_offset = item[0] if item else None
+        if item is None:
+            return None
+        if meta_offset is None:
+            return {}
+        with open(self.path, "rb") as f:
+            f.seek(meta_offset)
+            return json.loads(f.readline())["meta"]
+
+    def iter_entries(self, session_id):
+        """Yield a session's current transcript entries (as dicts), one line
+        at a time through the index, without building the transcript."""
+        self.flush()
+        with self._index_lock:
+            item = self._index.get(session_id)
+            offsets = array("q", item[1]) if item else array("q")
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield json.loads(f.readline())["entry"]
+
+    def flush(self):
+        """Block until everything appended so far is on disk."""
+        with self._cond:
+            target = self._appended
+            self._cond.notify_all()
+            while self._written < target and not self._closed:
+                self._cond.wait()
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._file.close()
+        self._lock_file.close()  # releases the lock
+
+    def _line(self, session_id, ts, record):
+        line = json.dumps({"ts": ts, "sid": session_id, **record}, separators=(",", ":"), ensure_ascii=False) + "\n"
+        return line.encode("utf-8")
+
+    def _write(self, session_id, records):
+        now = round(time.time(), 3)
+        items = [(self._line(session_id, now, record), record) for record in records]
+        with self._cond:
+            self._pending.extend((line, session_id, record) for line, record in items)
+            self._appended += len(items)
+            self._cond.notify_all()
+
+    def _index_record(self, record, offset):
+        session_id, op = record["sid"], record["op"]
+        with self._index_lock:
+            if op == "delete":
+                self._index.pop(session_id, None)
+                return
+            item = self._index.setdefault(session_id, [None, array("q")])
+            if op == "append":
+                item[1].append(offset)
+            elif op == "reset":
+                item[1] = array("q")
+            elif op == "meta":
+                item[0] = offset
+
+    def _records(self):
+        """(byte offset, record) for every readable line."""
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    yield offset, json.loads(line)
+                except ValueError:
+                    log.warning("Skipping unreadable line in %s", self.path)
+                offset += len(line)
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+            if self.flush_interval:
+                time.sleep(self.flush_interval)  # let more lines join this batch
+            with self._cond:
+                pending, self._pending = self._pending, []
+            # Appenders only wait for the condition, never for the disk
+            data = b"".join(line for line, _, _ in pending)
+            with self._file_lock:
+                offset = self._file.tell()
+                self._file.write(data)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                for line, session_id, record in pending:
+                    self._index_record({"sid": session_id, **record}, offset)
+                    offset += len(line)
+            with self._cond:
+                self.stats["fsyncs"] += bool(self.fsync)
+                self.stats["records"] += len(pending)
+                self.stats["batches"] += 1
+                self.stats["bytes"] += len(data)
+                self._written += len(pending)
+                self._cond.notify_all()
+
+
+def _lock_exclusive(f):
+    """Non-blocking exclusive lock on an open file; OSError when it is held."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
@@ -0,0 +1,134 @@
+import struct
+import subprocess
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+WAV_TYPES = {"audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave"}
+# Declared upload type -> ffmpeg demuxer, so ffmpeg doesn't have to probe
+CONTAINER_FORMATS = {
+    "audio/webm": "webm",
+    "video/webm": "webm",
+    "audio/ogg": "ogg",
+    "audio/mp4": "mp4",
+    "audio/mpeg": "mp3",
+}
+
+
+class AudioDecodeError(RuntimeError):
+    """ffmpeg could not decode any audio from the input."""
+
+
+def decode_pcm16(data: bytes, samplerate: int = SAMPLE_RATE, input_format: str = None) -> np.ndarray:
+    """Decode any ffmpeg-readable audio (webm/opus, wav, mp3...) from memory
+    into mono int16 samples by piping it through ffmpeg; nothing touches disk.
+    `input_format` names the demuxer when the container is known, instead
+    of letting ffmpeg probe for it.
+
+    A truncated stream (e.g. a MediaRecorder upload cut mid-cluster) still
+    returns whatever ffmpeg managed to decode; input that yields no samples
+    at all while ffmpeg reports an error raises AudioDecodeError.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0"]
+    if input_format:
+        cmd += ["-f", input_format]
+    cmd += [
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(samplerate),
+        "pipe:1",
+    ]
+    proc = subprocess.run(cmd, input=data, capture_output=True)
+    if proc.returncode != 0 and len(proc.stdout) < 2:
+        raise AudioDecodeError(f"Failed to load audio: {proc.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(proc.stdout, np.int16)
+
+
+def decode_audio_bytes(data: bytes, samplerate: int = SAMPLE_RATE, input_format: str = None) -> np.ndarray:
+    """Same as decode_pcm16 but returns float32 in [-1, 1], the format Whisper expects."""
+    return decode_pcm16(data, samplerate, input_format).astype(np.float32) / 32768.0
+
+
+def parse_wav_pcm16(data: bytes):
+    """(int16 samples, samplerate, channels) of a 16-bit PCM WAV, read straight
+    from the buffer; None for anything else (including a mislabelled webm)."""
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = int.from_bytes(data[pos + 4:pos + 8], "little")
+        body = pos + 8
+        if chunk_id == b"fmt " and size >= 16:
+            audio_format, channels, rate = struct.unpack_from("<HHI", data, body)
+            bits = struct.unpack_from("<H", data, body + 14)[0]
+            fmt = (audio_format, channels, rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None or fmt[0] != 1 or fmt[3] != 16 or fmt[1] < 1:
+                return None
+            channels = fmt[1]
+            # Recorders that stream WAV may leave a placeholder data size
+            end = min(body + size, len(data))
+            frames = (end - body) // (2 * channels)
+            return np.frombuffer(data, np.int16, count=frames * channels, offset=body), fmt[2], channels
+        pos = body + size + (size & 1)
+    return None
+
+
+def container_format(content_type: str = None):
+    """ffmpeg demuxer for a declared MIME type ("audio/webm;codecs=opus" -> "webm"), or None."""
+    return CONTAINER_FORMATS.get(_base_type(content_type))
+
+
+def _base_type(content_type):
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def decode_upload(data: bytes, content_type: str = None, samplerate: int = SAMPLE_RATE) -> np.ndarray:
+    """Float32 mono audio at `samplerate` from an uploaded answer, by the
+    cheapest route its declared type allows.
+
+    16-bit PCM WAV already at `samplerate` (what the browser client sends
+    after downsampling) is read directly: no ffmpeg process, no probing, no
+    resampling. Other known containers (webm/opus...) go to ffmpeg with
+    their demuxer named. Anything else, including the MediaRecorder webm
+    that older clients label audio/wav, is probed by ffmpeg as before.
+    """
+    mime = _base_type(content_type)
+    if mime in WAV_TYPES or data[:4] == b"RIFF":
+        wav = parse_wav_pcm16(data)
+        if wav is not None and wav[1] == samplerate:
+            samples, _, channels = wav
+            if channels > 1:
+                return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32) / 32768.0
+            return samples.astype(np.float32) / 32768.0
+        return decode_audio_bytes(data, samplerate)
+    return decode_audio_bytes(data, samplerate, container_format(mime))
+
+
+def stream_pcm16(path: str, samplerate: int = SAMPLE_RATE, block_seconds: float = 30.0, start_seconds: float = 0.0):
+    """Yield mono int16 blocks of `block_seconds` from the audio track of any
+    ffmpeg-readable file (webm with video included), starting at
+    `start_seconds`. Only one block is held in memory at a time, so hour-long
+    recordings decode in constant memory.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0"]
+    if start_seconds:
+        cmd += ["-ss", f"{start_seconds:.3f}"]
+    cmd += [
+        "-i", path, "-vn",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(samplerate),
+        "pipe:1",
+    ]
+    block_bytes = int(block_seconds * samplerate) * 2
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) - len(data) % 2], np.int16)
+    finally:
+        proc.stdout.close()
+        proc.kill()
+        proc.wait()
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from multiprocessing.connection import Client, Listener
+
+log = logging.getLogger("interview.engine")
+
+
+class EngineUnavailable(Exception):
+    pass
+
+
+class EngineError(Exception):
+    """An exception raised inside the engine worker; `kind` is its class name."""
+
+    def __init__(self, kind, message):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+        self.message = message
+
+
+def parse_address(address):
+    """"host:port" for TCP, anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def require_authkey(authkey):
+    """The connection authkey as bytes; refuses an empty one, since messages
+    are pickles and an unauthenticated peer could run code on unpickling."""
+    if not authkey:
+        raise ValueError("ENGINE_AUTHKEY must be set (to the same secret) for the API and engine_worker.py")
+    return authkey.encode("utf-8") if isinstance(authkey, str) else authkey
+
+
+class EngineClient:
+    """Blocking client for the engine worker (see EngineServer).
+
+    Keeps up to `max_connections` connections open and hands one to each
+    call, so transcription threads and TTS streams run side by side without
+    a reconnect per request. A request is a pickled tuple (op, *args); the
+    reply is ("ok", result) or ("error", kind, message), with ("chunk", data)
+    messages before the final reply for streamed ops.
+    """
+
+    def __init__(self, address, authkey, max_connections=8):
+        self.address = parse_address(address)
+        self.authkey = require_authkey(authkey)
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def call(self, op, *args):
+        with self._connection() as conn:
+            conn.send((op, *args))
+            reply = conn.recv()
+        return self._result(reply)
+
+    def stream(self, op, *args):
+        """Yield the ("chunk", data) payloads of a streamed op. Stopping early
+        drops the connection, since the worker is still sending on it."""
+        with self._connection() as conn:
+            conn.send((op, *args))
+            reply = conn.recv()
+            while reply[0] == "chunk":
+                yield reply[1]
+                reply = conn.recv()
+        self._result(reply)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    @contextmanager
+    def _connection(self):
+        with self._slots:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                try:
+                    conn = Client(self.address, authkey=self.authkey)
+                except OSError as e:
+                    raise EngineUnavailable(f"Engine worker at {self.address} is unreachable: {e}")
+            try:
+                yield conn
+            except (EOFError, OSError) as e:
+                conn.close()
+                raise EngineUnavailable(f"Lost the engine worker connection: {e}")
+            except BaseException:
+                # Includes GeneratorExit from an abandoned stream: the reply
+                # may be half read, so the connection can't be reused
+                conn.close()
+                raise
+            with self._lock:
+                self._idle.append(conn)
+
+    @staticmethod
+    def _result(reply):
+        if reply[0] == "error":
+            raise EngineError(reply[1], reply[2])
+        return reply[1]
+
+
+class EngineServer:
+    """Serves Whisper and TTS to API processes over multiprocessing.connection.
+
+    One thread per client connection; blocking ops (transcription) run on
+    that thread, TTS coroutines on a private event loop. `models` is a
+    ModelManager, `tts` an EdgeTTS, so every API worker shares one copy of
+    the weights and of the TTS cache. Connection threads may ask for the same
+    model at once; WhisperSTT's per-model lock runs one inference at a time.
+    """
+
+    def __init__(self, models, tts):
+        self.models = models
+        self.tts = tts
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="engine-tts", daemon=True).start()
+        self.ops = {
+            "status": models.status,
+            "transcribe": lambda variant, audio: models.get(variant).transcribe(audio),
+            "transcribe_audio": lambda variant, audio, prompt: models.get(variant).transcribe_audio(audio, prompt),
+            "transcribe_batch": lambda variant, audios: models.get(variant).transcribe_batch(audios),
+            "tts_prewarm": self._tts_prewarm,
+            "tts_cancel": self._tts_cancel,
+            "tts_cache_stats": lambda: tts.cache.stats() if tts.cache else {},
+        }
+
+    def serve_forever(self, address, authkey):
+        authkey = require_authkey(authkey)
+        address = parse_address(address)
+        with Listener(address, authkey=authkey) as listener:
+            if isinstance(address, str):
+                # Unix socket: only this user may even attempt the handshake
+                os.chmod(address, 0o600)
+            log.info("Engine worker listening on %s", address)
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    log.warning("Rejected engine connection: %s", e)
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), name="engine-conn", daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    op, *args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if op == "tts_stream":
+                        self._tts_stream(conn, *args)
+                    elif op in self.ops:
+                        conn.send(("ok", self.ops[op](*args)))
+                    else:
+                        conn.send(("error", "UnknownOp", op))
+                except OSError:
+                    return  # client went away mid-reply
+                except Exception as e:
+                    log.warning("Engine op %s failed: %s", op, e)
+                    try:
+                        conn.send(("error", type(e).__name__, str(e)))
+                    except OSError:
+                        return
+
+    def _tts_prewarm(self, texts):
+        # TTSCache.prewarm schedules tasks, so it has to run on the TTS loop
+        self.loop.call_soon_threadsafe(self.tts.prewarm, texts)
+
+    def _tts_cancel(self, texts):
+        self.loop.call_soon_threadsafe(self.tts.cancel_prewarm, texts)
+
+    def _tts_stream(self, conn, text):
+        chunks = queue.Queue()
+
+        async def pump():
+            try:
+                async for chunk in self.tts.stream(text):
+                    chunks.put(chunk)
+                chunks.put(None)
+            except Exception as e:
+                chunks.put(e)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    conn.send(("ok", None))
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                conn.send(("chunk", item))
+        finally:
+            future.cancel()
@@ -0,0 +1,66 @@
+import json
+import logging
+import random
+import sys
+import time
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; fields passed as extra={"fields": {...}}
+    are merged into the top level."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:<7} [{record.name}] {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """Lets through a `rate` share of DEBUG/INFO records; warnings and
+    errors are always kept."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+def setup_logging(level="INFO", fmt="text", sample_rate=1.0):
+    """Configure the "interview" logger tree once at startup.
+
+    Log calls below `level` return after a single level check, before any
+    record is built or message formatted, so per-turn DEBUG logging costs
+    nothing when it is off. `sample_rate` < 1 thins out INFO/DEBUG volume.
+    """
+    logger = logging.getLogger("interview")
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    if sample_rate < 1:
+        handler.addFilter(SamplingFilter(sample_rate))
+    logger.addHandler(handler)
+    return logger
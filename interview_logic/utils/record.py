@@ -2,6 +2,7 @@ import sounddevice as sd
 import numpy as np
 import tempfile
 import scipy.io.wavfile
+from interview_logic.utils.vad import trim_silence
 
 def record_until_silence(samplerate=16000, silence_threshold=100, silence_duration=1.5):
     block_size = int(0.1 * samplerate)
@@ -25,7 +26,11 @@ def record_until_silence(samplerate=16000, silence_threshold=100, silence_durati
             if silent_counter >= silence_blocks:
                 break
 
-    audio = np.concatenate(audio_frames, axis=0)
+    audio = np.concatenate(audio_frames, axis=0)[:, 0]
+    # Drop the leading and trailing silence (including the silence_duration
+    # tail that ended the recording) so it never reaches Whisper
+    audio = trim_silence(audio.astype(np.float32) / 32768.0, samplerate)
+    audio = (audio * 32768.0).astype(np.int16)
     with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmpfile:
         scipy.io.wavfile.write(tmpfile.name, samplerate, audio)
         return tmpfile.name  # temp file path to delete after use
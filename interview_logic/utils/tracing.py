@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+# Upper bounds in ms; covers a cache-hit TTS chunk up to a slow webhook
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the shape Prometheus expects."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Turn:
+    """Spans recorded for one /answer call. Stage times are in ms; a stage
+    that runs more than once in a turn (e.g. one per VAD chunk) is summed."""
+
+    def __init__(self, tracer, session_id, number):
+        self.tracer = tracer
+        self.session_id = session_id
+        self.number = number
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.spans = {}
+        self.total_ms = None
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - started) * 1000)
+
+    def add(self, stage, ms):
+        self.spans[stage] = round(self.spans.get(stage, 0) + ms, 1)
+        self.tracer.observe(stage, ms)
+
+    def finish(self):
+        if self.total_ms is None:
+            self.total_ms = round((time.perf_counter() - self.started) * 1000, 1)
+            self.tracer.observe("turn_total", self.total_ms)
+
+    def to_dict(self):
+        return {
+            "turn": self.number,
+            "started_at": self.started_at,
+            "total_ms": self.total_ms,
+            "spans_ms": dict(self.spans),
+        }
+
+
+class Tracer:
+    """Per-session, per-turn stage timings plus one histogram per stage.
+
+    Keeps the last `turns_per_session` turns for at most `max_sessions`
+    sessions (least recently traced dropped first), so memory stays bounded
+    no matter how long the server runs. Histograms cover every turn ever
+    traced and are rendered by prometheus_text().
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS, turns_per_session=20, max_sessions=1000):
+        self.buckets = tuple(buckets)
+        self.turns_per_session = turns_per_session
+        self.max_sessions = max_sessions
+        self.histograms = {}
+        self.sessions = OrderedDict()
+        self.turn_counts = {}
+        self._lock = threading.Lock()
+
+    def start_turn(self, session_id):
+        with self._lock:
+            number = self.turn_counts.get(session_id, 0) + 1
+            self.turn_counts[session_id] = number
+            turn = Turn(self, session_id, number)
+            turns = self.sessions.pop(session_id, None) or deque(maxlen=self.turns_per_session)
+            turns.append(turn)
+            self.sessions[session_id] = turns
+            while len(self.sessions) > self.max_sessions:
+                dropped, _ = self.sessions.popitem(last=False)
+                self.turn_counts.pop(dropped, None)
+        return turn
+
+    def current_turn(self, session_id):
+        turns = self.sessions.get(session_id)
+        return turns[-1] if turns else None
+
+    def record(self, session_id, stage, ms):
+        """Attach a stage that happens outside /answer (e.g. TTS streaming of
+        the reply) to the session's latest turn; histogram only if none."""
+        turn = self.current_turn(session_id) if session_id else None
+        if turn is not None:
+            turn.add(stage, ms)
+        else:
+            self.observe(stage, ms)
+
+    def observe(self, stage, ms):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram(self.buckets)
+            histogram.observe(ms)
+
+    def session_turns(self, session_id):
+        return [turn.to_dict() for turn in self.sessions.get(session_id, ())]
+
+    def prometheus_text(self, name="interview_stage_duration_ms", gauges=None):
+        """Render the stage histograms (and optional extra values, given as
+        {metric_name: value}; names ending in _total are typed as counters)
+        in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {name} Time spent in each stage of an interview turn.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.1f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        for metric, value in (gauges or {}).items():
+            if value is not None:
+                lines.append(f"# TYPE {metric} {'counter' if metric.endswith('_total') else 'gauge'}")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
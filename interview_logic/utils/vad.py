@@ -0,0 +1,125 @@
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def frame_features(audio, samplerate=SAMPLE_RATE, frame_ms=30):
+    """Per-frame log energy (dBFS) and zero-crossing rate, computed in one
+    vectorized pass over non-overlapping frames."""
+    frame_len = int(samplerate * frame_ms / 1000)
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, np.float32), np.zeros(0, np.float32), frame_len
+
+    frames = np.asarray(audio[:n_frames * frame_len], dtype=np.float32).reshape(n_frames, frame_len)
+    energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+    return energy_db, zcr, frame_len
+
+
+def noise_floor(energy_db, block_frames=33, percentile=10):
+    """Adaptive noise floor: a low percentile of frame energy over ~1s blocks,
+    so a fan starting halfway through an answer raises the floor from there on."""
+    n_blocks = max(1, int(np.ceil(len(energy_db) / block_frames)))
+    padded = np.full(n_blocks * block_frames, np.nan, np.float32)
+    padded[:len(energy_db)] = energy_db
+    block_floor = np.nanpercentile(padded.reshape(n_blocks, block_frames), percentile, axis=1)
+    # Never let a block of continuous speech pull the floor up to speech level
+    block_floor = np.minimum(block_floor, np.percentile(energy_db, percentile) + 6)
+    return np.repeat(block_floor, block_frames)[:len(energy_db)]
+
+
+def speech_mask(audio, samplerate=SAMPLE_RATE, frame_ms=30, margin_db=10.0, min_energy_db=-55.0,
+                fricative_zcr=0.3, hangover_ms=300, min_speech_ms=90):
+    """Boolean speech/non-speech decision per frame.
+
+    A frame is speech when its energy is `margin_db` above the local noise
+    floor, or when it is moderately loud with a high zero-crossing rate
+    (unvoiced consonants like "s" and "f" are quiet but noisy). Short blips
+    are dropped and each speech run is extended by `hangover_ms` so word
+    endings and short pauses are kept.
+    """
+    energy_db, zcr, frame_len = frame_features(audio, samplerate, frame_ms)
+    if len(energy_db) == 0:
+        return np.zeros(0, bool), frame_len
+
+    floor = noise_floor(energy_db)
+    voiced = energy_db > np.maximum(floor + margin_db, min_energy_db)
+    unvoiced = (energy_db > np.maximum(floor + margin_db / 2, min_energy_db)) & (zcr > fricative_zcr)
+    mask = voiced | unvoiced
+
+    min_frames = max(1, int(min_speech_ms / frame_ms))
+    if min_frames > 1:
+        # Keep only frames that sit inside a run of at least min_frames speech frames
+        runs = np.convolve(mask.astype(np.int32), np.ones(min_frames, np.int32), mode="valid") == min_frames
+        keep = np.zeros_like(mask)
+        for offset in range(min_frames):
+            keep[offset:offset + len(runs)] |= runs
+        mask = keep
+
+    hangover = int(hangover_ms / frame_ms)
+    if hangover and mask.any():
+        mask = np.convolve(mask.astype(np.int32), np.ones(2 * hangover + 1, np.int32), mode="same") > 0
+    return mask, frame_len
+
+
+def speech_segments(audio, samplerate=SAMPLE_RATE, max_segment_seconds=30.0, **kwargs):
+    """Return (start, end) sample ranges containing speech.
+
+    Segments longer than `max_segment_seconds` are split so each one fits in
+    a single Whisper window. An all-silence clip returns [].
+    """
+    mask, frame_len = speech_mask(audio, samplerate, **kwargs)
+    if not mask.any():
+        return []
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    starts, ends = edges[0::2] * frame_len, np.minimum(edges[1::2] * frame_len, len(audio))
+
+    max_len = int(max_segment_seconds * samplerate)
+    segments = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        while end - start > max_len:
+            segments.append((start, start + max_len))
+            start += max_len
+        segments.append((start, end))
+    return segments
+
+
+def speech_bounds(audio, samplerate=SAMPLE_RATE, **kwargs):
+    """(start, end) samples from the first to the last speech frame, or None for silence."""
+    mask, frame_len = speech_mask(audio, samplerate, **kwargs)
+    speech = np.flatnonzero(mask)
+    if len(speech) == 0:
+        return None
+    return int(speech[0]) * frame_len, min(int(speech[-1] + 1) * frame_len, len(audio))
+
+
+def trim_silence(audio, samplerate=SAMPLE_RATE, **kwargs):
+    """Drop leading and trailing non-speech; returns an empty array for silence."""
+    bounds = speech_bounds(audio, samplerate, **kwargs)
+    if bounds is None:
+        return audio[:0]
+    return audio[bounds[0]:bounds[1]]
+
+
+def speech_chunks(audio, samplerate=SAMPLE_RATE, max_chunk_seconds=30.0, **kwargs):
+    """Cut the silence out of a clip and pack the remaining speech into
+    chunks of at most `max_chunk_seconds`.
+
+    Whisper pads every input to a 30s window, so sending many short segments
+    would cost more than the silence it saves; packing keeps one model pass
+    per 30s of actual speech. Returns [] when the clip has no speech.
+    """
+    max_len = int(max_chunk_seconds * samplerate)
+    chunks, current, current_len = [], [], 0
+    for start, end in speech_segments(audio, samplerate, max_segment_seconds=max_chunk_seconds, **kwargs):
+        if current and current_len + (end - start) > max_len:
+            chunks.append(np.concatenate(current))
+            current, current_len = [], 0
+        current.append(audio[start:end])
+        current_len += end - start
+    if current:
+        chunks.append(np.concatenate(current))
+    return chunks